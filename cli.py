@@ -1,16 +1,17 @@
 """视频字幕生成器 CLI 入口"""
 import click
+import os
 from pathlib import Path
+import queue
 import sys
+import threading
 from typing import List, Optional
-from tqdm import tqdm
-from src.extractor.ffmpeg_extractor import AudioExtractor
-from src.transcriber.whisper_transcriber import WhisperTranscriber
-from src.translator.openai_translator import OpenAITranslator
-from src.formatter.srt_formatter import SRTFormatter
-from src.formatter.text_formatter import TextFormatter
-from src.utils.helpers import setup_logger, is_video_file, process_path_arguments, get_video_files, setup_default_logger
-from src.config.settings import get_settings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from src.utils.helpers import (
+    setup_logger, is_video_file, process_path_arguments, get_video_files, setup_default_logger,
+    ensure_dir_once
+)
+from src.config.settings import Settings, get_settings, set_settings
 from src.utils.cost_calculator import CostCalculator
 from src.utils.checkpoint import CheckpointManager, CheckpointStage
 from src.utils.exceptions import VideoCaptionError
@@ -64,6 +65,8 @@ def extract(video_path: tuple, output: Path, sample_rate: int):
         logger.error(f"不支持的视频格式: {video_file.suffix}")
         sys.exit(1)
     
+    from src.extractor.ffmpeg_extractor import AudioExtractor
+    
     try:
         # 创建提取器
         extractor = AudioExtractor()
@@ -106,10 +109,15 @@ def extract(video_path: tuple, output: Path, sample_rate: int):
               help='单个段落最大时长（秒）')
 @click.option('--no-redistribute-timestamps', is_flag=True,
               help='禁用时间戳重分配')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=1,
+              help='同时处理的视频数 (默认: 1)')
+@click.option('--batch-asr', is_flag=True,
+              help='本地识别时跨文件批量解码（适合大量短视频）')
 def process(video_path: tuple, lang: str, format: str, output_dir: Path, 
            recursive: bool, resume: bool, config: Path,
            no_paragraph_mode: bool, paragraph_silence: float,
-           paragraph_max_duration: float, no_redistribute_timestamps: bool):
+           paragraph_max_duration: float, no_redistribute_timestamps: bool,
+           workers: int, batch_asr: bool):
     """处理视频生成字幕（完整流程）
     
     示例：
@@ -126,6 +134,9 @@ def process(video_path: tuple, lang: str, format: str, output_dir: Path,
         
         # 从断点继续
         python cli.py process video.mp4 --resume
+        
+        # 同时处理 4 个视频
+        python cli.py process ./videos/ --workers 4
     """
     # 如果指定了配置文件，重新加载配置
     if config:
@@ -168,13 +179,7 @@ def process(video_path: tuple, lang: str, format: str, output_dir: Path,
         video_files = [input_path]
     elif input_path.is_dir():
         # 目录处理
-        if recursive:
-            # 递归查找所有视频文件
-            video_files = list(input_path.rglob("*"))
-            video_files = [f for f in video_files if f.is_file() and is_video_file(f)]
-        else:
-            # 只处理当前目录
-            video_files = get_video_files(input_path)
+        video_files = get_video_files(input_path, recursive=recursive)
         
         if not video_files:
             logger.error(f"目录中没有找到视频文件: {input_path}")
@@ -191,6 +196,31 @@ def process(video_path: tuple, lang: str, format: str, output_dir: Path,
     # 初始化断点管理器
     checkpoint_manager = CheckpointManager() if resume else None
     
+    workers = min(workers, len(video_files))
+    # 本地 GPU 识别用线程池，多个文件共享同一个模型，由 GPU 自然串行；其余情况用进程池
+    use_threads = settings.whisper.backend == "local" and settings.whisper.device != "cpu"
+    if workers > 1:
+        logger.info(f"并行处理 {workers} 个视频（{'线程' if use_threads else '进程'}池）")
+        if not use_threads:
+            # 线程共享进程内的限流器；子进程各自限速，平分总的 RPM 额度
+            settings.openai.requests_per_minute = max(1, settings.openai.requests_per_minute // workers)
+            if settings.openai.tokens_per_minute > 0:
+                settings.openai.tokens_per_minute = max(1, settings.openai.tokens_per_minute // workers)
+            logger.info(f"每个 worker 进程限速 {settings.openai.requests_per_minute} RPM")
+            if settings.whisper.backend == "local":
+                # 每个子进程各自加载模型，平分 CPU 核心，避免 workers × 核心数个推理线程互相争抢
+                total_threads = settings.whisper.cpu_threads or os.cpu_count() or 1
+                settings.whisper.cpu_threads = max(1, total_threads // workers)
+                logger.info(f"每个 worker 进程使用 {settings.whisper.cpu_threads} 个 CPU 推理线程")
+    
+    # 本地识别先加载模型，后续每个文件直接复用（子进程各自加载，不在父进程预热）
+    if settings.whisper.backend == "local" and (workers == 1 or use_threads):
+        from src.transcriber.faster_whisper_backend import FasterWhisperBackend
+        FasterWhisperBackend.warmup(settings.whisper)
+    
+    # 费用计算器在整个批次中复用
+    cost_calculator = CostCalculator(settings.api_pricing.model_dump())
+    
     # 总费用累计
     total_whisper_cost = 0.0
     total_gpt_cost = 0.0
@@ -198,37 +228,95 @@ def process(video_path: tuple, lang: str, format: str, output_dir: Path,
     total_input_tokens = 0
     total_output_tokens = 0
     
+    def accumulate(result: Optional[dict]) -> None:
+        nonlocal total_whisper_cost, total_gpt_cost, total_duration
+        nonlocal total_input_tokens, total_output_tokens
+        if result:
+            total_whisper_cost += result['whisper_cost']
+            total_gpt_cost += result['gpt_cost']
+            total_duration += result['duration']
+            total_input_tokens += result['input_tokens']
+            total_output_tokens += result['output_tokens']
+    
+    # tqdm 只有批量处理用到，延迟导入，其他子命令和进程池子进程启动时不加载
+    from tqdm import tqdm
+    
     # 处理每个视频文件
-    with tqdm(total=len(video_files), desc="处理视频", unit="个") as pbar:
-        for video_file in video_files:
-            try:
-                # 显示当前文件
-                pbar.set_description(f"处理: {video_file.name}")
-                
-                # 处理单个视频
-                result = process_single_video(
-                    video_file, lang, format, output_dir, 
-                    settings, checkpoint_manager
-                )
-                
-                # 累计费用
-                if result:
-                    total_whisper_cost += result['whisper_cost']
-                    total_gpt_cost += result['gpt_cost']
-                    total_duration += result['duration']
-                    total_input_tokens += result['input_tokens']
-                    total_output_tokens += result['output_tokens']
-                
-                # 更新进度
-                pbar.update(1)
-                
-            except Exception as e:
-                logger.error(f"处理 {video_file.name} 失败: {e}")
-                if len(video_files) == 1:
-                    sys.exit(1)
-                # 批量处理时继续处理下一个
+    # 进度条只在主线程更新；文件名放在 postfix 中随周期刷新一起输出，不单独写终端
+    # disable=None：输出被重定向（CI、批处理）时不显示进度条，也不启动 tqdm 的监控线程
+    with tqdm(
+        total=len(video_files), desc="处理视频", unit="个",
+        mininterval=0.5, smoothing=0.1, disable=None
+    ) as pbar:
+        if workers > 1:
+            if use_threads:
+                executor = ThreadPoolExecutor(max_workers=workers)
+                submit_args = (settings, checkpoint_manager, cost_calculator)
+                target = process_single_video
+            else:
+                # 子进程无法共享全局配置，传入可序列化的字典后在子进程中重建
+                from concurrent.futures import ProcessPoolExecutor
+                executor = ProcessPoolExecutor(max_workers=workers)
+                submit_args = (settings.model_dump(), resume)
+                target = _process_video_worker
+            
+            with executor:
+                futures = {
+                    executor.submit(target, video_file, lang, format, output_dir, *submit_args): video_file
+                    for video_file in video_files
+                }
+                for future in as_completed(futures):
+                    video_file = futures[future]
+                    try:
+                        accumulate(future.result())
+                    except Exception as e:
+                        logger.error(f"处理 {video_file.name} 失败: {e}")
+                    pbar.set_postfix_str(video_file.name[:30], refresh=False)
+                    pbar.update(1)
+        elif len(video_files) > 1:
+            if batch_asr and settings.whisper.backend == "local":
+                runner = run_batched_transcription
+            else:
+                if batch_asr:
+                    logger.warning("--batch-asr 仅适用于本地识别后端，已忽略")
+                # 单 worker 批量处理时按阶段流水线重叠执行
+                runner = run_pipeline
+            for video_file, result in runner(
+                video_files, lang, format, output_dir,
+                settings, checkpoint_manager, cost_calculator
+            ):
+                if not isinstance(result, Exception):
+                    accumulate(result)
+                pbar.set_postfix_str(video_file.name[:30], refresh=False)
                 pbar.update(1)
-                continue
+        else:
+            for video_file in video_files:
+                try:
+                    # 显示当前文件
+                    pbar.set_postfix_str(video_file.name[:30])
+                    
+                    # 处理单个视频
+                    result = process_single_video(
+                        video_file, lang, format, output_dir, 
+                        settings, checkpoint_manager, cost_calculator
+                    )
+                    
+                    # 累计费用
+                    accumulate(result)
+                    
+                    # 更新进度
+                    pbar.update(1)
+                    
+                except Exception as e:
+                    logger.error(f"处理 {video_file.name} 失败: {e}")
+                    if len(video_files) == 1:
+                        sys.exit(1)
+                    # 批量处理时继续处理下一个
+                    pbar.update(1)
+                    continue
+    
+    if checkpoint_manager:
+        checkpoint_manager.flush()
     
     # 显示总费用汇总
     if len(video_files) > 1:
@@ -236,7 +324,6 @@ def process(video_path: tuple, lang: str, format: str, output_dir: Path,
         click.echo("📊 批量处理完成")
         click.echo(f"  处理文件数: {len(video_files)}")
         
-        cost_calculator = CostCalculator(settings.api_pricing.model_dump())
         click.echo(cost_calculator.format_cost_summary(
             whisper_cost=total_whisper_cost,
             gpt_cost=total_gpt_cost,
@@ -246,28 +333,159 @@ def process(video_path: tuple, lang: str, format: str, output_dir: Path,
         ))
 
 
+# 格式化器无状态，按当前配置对象复用；配置被替换（如 --config、子进程）时重建
+_formatters: Optional[tuple] = None
+_instances_lock = threading.Lock()
+
+
+def get_formatters() -> tuple:
+    """获取与当前配置对应的 (SRTFormatter, TextFormatter)"""
+    global _formatters
+    from src.formatter import SRTFormatter, TextFormatter
+    
+    settings = get_settings()
+    with _instances_lock:
+        if _formatters is None or _formatters[0] is not settings:
+            _formatters = (settings, SRTFormatter(), TextFormatter())
+        return _formatters[1:]
+
+
+# 识别器无状态（模型和客户端在构造时准备好），同样按配置对象复用
+_transcriber: Optional[tuple] = None
+
+
+def get_transcriber():
+    """获取与当前配置对应的 WhisperTranscriber"""
+    global _transcriber
+    from src.transcriber.whisper_transcriber import WhisperTranscriber
+    
+    settings = get_settings()
+    with _instances_lock:
+        if _transcriber is None or _transcriber[0] is not settings:
+            _transcriber = (settings, WhisperTranscriber())
+        return _transcriber[1]
+
+
+def release_transcriber() -> None:
+    """释放识别器及本地模型
+    
+    只剩翻译和输出阶段时调用，本地模型占用的显存在等待翻译 API 期间即可归还；
+    之后如需识别，get_transcriber 会重新创建。
+    """
+    global _transcriber
+    with _instances_lock:
+        _transcriber = None
+    if get_settings().whisper.backend == "local":
+        from src.transcriber.faster_whisper_backend import FasterWhisperBackend
+        FasterWhisperBackend.release()
+
+
+# 输出文件写入线程池，进程内共享
+_output_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_output_executor() -> ThreadPoolExecutor:
+    """获取写输出文件用的共享线程池"""
+    global _output_executor
+    with _instances_lock:
+        if _output_executor is None:
+            _output_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="output")
+        return _output_executor
+
+
+def save_outputs(
+    segments: list,
+    format: str,
+    srt_path: Path,
+    txt_path: Path,
+    include_original: bool
+) -> None:
+    """写出字幕文件，同时输出 SRT 和文本时并发写入"""
+    srt_formatter, text_formatter = get_formatters()
+    
+    jobs = []
+    if format in ['srt', 'both']:
+        jobs.append((srt_formatter, srt_path))
+    if format in ['text', 'both']:
+        jobs.append((text_formatter, txt_path))
+    
+    # 其余格式交给共享线程池，最后一个在当前线程写，不必每个视频新建线程池
+    *others, (formatter, path) = jobs
+    futures = [
+        get_output_executor().submit(other.save, segments, other_path, include_original=include_original)
+        for other, other_path in others
+    ]
+    formatter.save(segments, path, include_original=include_original)
+    for future in futures:
+        future.result()
+
+
+def _process_video_worker(
+    video_file: Path,
+    lang: str,
+    format: str,
+    output_dir: Optional[Path],
+    settings_data: dict,
+    resume: bool
+) -> Optional[dict]:
+    """进程池入口：在子进程中恢复配置后处理单个视频"""
+    worker_settings = set_settings(Settings(**settings_data))
+    checkpoint_manager = CheckpointManager() if resume else None
+    try:
+        return process_single_video(
+            video_file, lang, format, output_dir,
+            worker_settings, checkpoint_manager,
+            CostCalculator(settings_data['api_pricing'])
+        )
+    finally:
+        # 进程池的子进程退出时不执行 atexit，需要主动写完断点
+        if checkpoint_manager:
+            checkpoint_manager.flush()
+
+
 def process_single_video(
     video_file: Path,
     lang: str,
     format: str,
     output_dir: Optional[Path],
     settings: any,
-    checkpoint_manager: Optional[CheckpointManager]
+    checkpoint_manager: Optional[CheckpointManager],
+    cost_calculator: Optional[CostCalculator] = None
 ) -> Optional[dict]:
     """处理单个视频文件
     
+    Args:
+        cost_calculator: 批量处理时由调用方复用同一个实例，未提供时按当前配置创建
+    
     Returns:
         处理结果字典，包含费用信息
     """
+    if cost_calculator is None:
+        cost_calculator = CostCalculator(settings.api_pricing.model_dump())
+    job = create_job(video_file, lang, format, output_dir, checkpoint_manager)
+    try:
+        for stage in PIPELINE_STAGES:
+            stage(job, settings, checkpoint_manager)
+        return job_result(job, cost_calculator)
+    except Exception as e:
+        logger.error(f"处理 {video_file.name} 失败: {e}")
+        raise
+
+
+def create_job(
+    video_file: Path,
+    lang: str,
+    format: str,
+    output_dir: Optional[Path],
+    checkpoint_manager: Optional[CheckpointManager]
+) -> dict:
+    """创建单个视频的处理任务，各阶段之间通过它传递中间结果"""
     # 确定输出目录
     if output_dir is None:
+        # 默认输出到视频所在目录，目录必然存在
         output_dir = video_file.parent
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # 生成输出文件名
-    base_name = video_file.stem
-    srt_path = output_dir / f"{base_name}_{lang}.srt"
-    txt_path = output_dir / f"{base_name}_{lang}.txt"
+    else:
+        ensure_dir_once(output_dir)
     
     # 检查断点
     checkpoint_data = None
@@ -276,146 +494,499 @@ def process_single_video(
         if checkpoint_data:
             logger.info(f"从断点继续: {checkpoint_data['stage']}")
     
-    try:
-        # 初始化组件
-        extractor = AudioExtractor()
-        transcriber = WhisperTranscriber()
-        translator = OpenAITranslator()
-        
-        # 1. 提取音频
-        audio_path = None
-        if not checkpoint_data or checkpoint_data['stage'] == CheckpointStage.AUDIO_EXTRACTION:
+    # 生成输出文件名
+    base_name = video_file.stem
+    return {
+        'video_file': video_file,
+        'lang': lang,
+        'format': format,
+        'srt_path': output_dir / f"{base_name}_{lang}.srt",
+        'txt_path': output_dir / f"{base_name}_{lang}.txt",
+        'checkpoint_data': checkpoint_data,
+        'audio_path': None,
+        'audio_data': None,
+        'transcription': None,
+        'translation': None,
+        'error': None
+    }
+
+
+def extract_stage(job: dict, settings: any, checkpoint_manager: Optional[CheckpointManager]) -> None:
+    """阶段 1：提取音频"""
+    from src.extractor.ffmpeg_extractor import AudioExtractor
+    
+    video_file = job['video_file']
+    checkpoint_data = job['checkpoint_data']
+    if needs_extraction(job):
+        # 已由批量提取填好 audio_path 时只需记录断点
+        if job['audio_path'] is None:
             logger.info(f"提取音频: {video_file.name}")
-            audio_path = extractor.extract_audio(video_file)
-            
-            if checkpoint_manager:
-                checkpoint_manager.save_checkpoint(
-                    video_file,
-                    {"audio_path": str(audio_path)},
-                    CheckpointStage.TRANSCRIPTION,
-                    progress=25.0
-                )
-        else:
-            # 从断点恢复音频路径
-            audio_path = Path(checkpoint_data['state'].get('audio_path'))
+            extractor = AudioExtractor()
+            if use_audio_pipe(settings):
+                # 本地识别直接读取 FFmpeg 管道输出，不写临时音频文件
+                job['audio_data'] = extractor.extract_audio_array(video_file)
+            else:
+                job['audio_path'] = extractor.extract_audio(video_file)
         
-        # 2. 语音识别
-        transcription = None
-        if not checkpoint_data or checkpoint_data['stage'] in [CheckpointStage.TRANSCRIPTION, CheckpointStage.AUDIO_EXTRACTION]:
-            logger.info(f"语音识别: {video_file.name}")
+        if checkpoint_manager and job['audio_path']:
+            checkpoint_manager.save_checkpoint(
+                video_file,
+                {"audio_path": str(job['audio_path'])},
+                CheckpointStage.TRANSCRIPTION,
+                progress=25.0
+            )
+    elif checkpoint_data['state'].get('audio_path'):
+        # 从断点恢复音频路径
+        job['audio_path'] = Path(checkpoint_data['state']['audio_path'])
+
+
+def use_audio_pipe(settings: any) -> bool:
+    """是否把音频直接读入内存而不写临时音频文件"""
+    return settings.whisper.backend == "local" and not settings.processing.keep_temp_files
+
+
+def needs_extraction(job: dict) -> bool:
+    """任务是否还需要提取音频"""
+    checkpoint_data = job['checkpoint_data']
+    return not checkpoint_data or checkpoint_data['stage'] == CheckpointStage.AUDIO_EXTRACTION
+
+
+def transcribe_stage(job: dict, settings: any, checkpoint_manager: Optional[CheckpointManager]) -> None:
+    """阶段 2：语音识别"""
+    from src.transcriber.whisper_transcriber import TranscriptionResult
+    
+    video_file = job['video_file']
+    audio_path = job['audio_path']
+    checkpoint_data = job['checkpoint_data']
+    if needs_transcription(job):
+        logger.info(f"语音识别: {video_file.name}")
+        transcriber = get_transcriber()
+        if job['audio_data'] is not None:
+            transcription = transcriber.transcribe(job['audio_data'])
+            job['audio_data'] = None
+        else:
             # 检查文件大小，决定是否使用分段处理
-            file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+            # 只 stat 一次，大小传给转录器，不再重复获取
+            file_size = audio_path.stat().st_size
+            file_size_mb = file_size / (1024 * 1024)
             if file_size_mb > 20:
                 logger.info(f"音频文件较大 ({file_size_mb:.1f}MB)，使用分段处理")
-                transcription = transcriber.transcribe_with_chunks(audio_path, chunk_duration=settings.processing.chunk_duration)
-            else:
-                transcription = transcriber.transcribe(audio_path)
-            
-            if checkpoint_manager:
-                checkpoint_manager.save_checkpoint(
-                    video_file,
-                    {
-                        "audio_path": str(audio_path),
-                        "transcription": {
-                            "language": transcription.language,
-                            "duration": transcription.duration,
-                            "segments": [s.model_dump() for s in transcription.segments]
-                        }
-                    },
-                    CheckpointStage.TRANSLATION,
-                    progress=50.0
+                transcription = transcriber.transcribe_with_chunks(
+                    audio_path,
+                    chunk_duration=settings.processing.chunk_duration,
+                    file_size=file_size
                 )
-        else:
-            # 从断点恢复转录结果
-            from src.transcriber.whisper_transcriber import TranscriptionResult, TranscriptionSegment
-            trans_data = checkpoint_data['state']['transcription']
-            segments = [TranscriptionSegment(**s) for s in trans_data['segments']]
-            transcription = TranscriptionResult(
-                segments=segments,
-                language=trans_data['language'],
-                duration=trans_data['duration']
-            )
+            else:
+                transcription = transcriber.transcribe(audio_path, file_size=file_size)
         
-        # 3. 翻译
-        translation = None
-        if not checkpoint_data or checkpoint_data['stage'] in [CheckpointStage.TRANSLATION, CheckpointStage.TRANSCRIPTION, CheckpointStage.AUDIO_EXTRACTION]:
+        job['transcription'] = transcription
+        save_transcription_checkpoint(job, checkpoint_manager)
+    else:
+        # 从断点恢复转录结果，整体交给 pydantic-core 一次校验
+        trans_data = checkpoint_data['state']['transcription']
+        job['transcription'] = TranscriptionResult.model_validate({
+            **trans_data,
+            "text": " ".join(s['text'] for s in trans_data['segments'])
+        })
+
+
+def needs_transcription(job: dict) -> bool:
+    """任务是否还需要语音识别（未从断点恢复转录结果）"""
+    checkpoint_data = job['checkpoint_data']
+    return not checkpoint_data or checkpoint_data['stage'] in [
+        CheckpointStage.TRANSCRIPTION, CheckpointStage.AUDIO_EXTRACTION
+    ]
+
+
+def save_transcription_checkpoint(job: dict, checkpoint_manager: Optional[CheckpointManager]) -> None:
+    """保存识别完成后的断点"""
+    if not checkpoint_manager:
+        return
+    checkpoint_manager.save_checkpoint(
+        job['video_file'],
+        {
+            "audio_path": str(job['audio_path']) if job['audio_path'] else None,
+            "transcription": _dump_transcription(job['transcription'])
+        },
+        CheckpointStage.TRANSLATION,
+        progress=50.0
+    )
+
+
+def _dump_transcription(transcription) -> dict:
+    """序列化转录结果用于断点
+    
+    对整个模型调用一次 model_dump，由 pydantic-core 完成遍历，
+    比逐个片段调用 model_dump 快数倍。全文可由片段拼出，不重复保存。
+    """
+    return transcription.model_dump(include={'language', 'duration', 'segments'})
+
+
+def translate_stage(job: dict, settings: any, checkpoint_manager: Optional[CheckpointManager]) -> None:
+    """阶段 3：翻译"""
+    from src.translator.openai_translator import (
+        OpenAITranslator, TranslationResult, is_same_language, passthrough_translation
+    )
+    
+    if job['translation'] is not None:
+        # 已在合并翻译中完成
+        return
+    
+    video_file = job['video_file']
+    lang = job['lang']
+    transcription = job['transcription']
+    if needs_translation(job):
+        if is_same_language(transcription.language, lang):
+            # 源语言即目标语言，跳过翻译，也不创建翻译客户端
+            logger.info(f"识别语言与目标语言相同（{transcription.language}），跳过翻译: {video_file.name}")
+            job['translation'] = passthrough_translation(
+                transcription.segments,
+                transcription.language,
+                lang
+            )
+        else:
             logger.info(f"翻译到{lang}: {video_file.name}")
-            translation = translator.translate(
+            translator = OpenAITranslator()
+            job['translation'] = translator.translate(
                 transcription.segments,
                 transcription.language
             )
-            
-            if checkpoint_manager:
-                checkpoint_manager.save_checkpoint(
-                    video_file,
-                    {
-                        "audio_path": str(audio_path),
-                        "translation_complete": True,
-                        "input_tokens": translation.input_tokens,
-                        "output_tokens": translation.output_tokens
-                    },
-                    CheckpointStage.FORMATTING,
-                    progress=75.0
-                )
+        save_translation_checkpoint(job, checkpoint_manager)
+    else:
+        # 从断点恢复翻译结果
+        job['translation'] = TranslationResult.model_validate(
+            job['checkpoint_data']['state']['translation']
+        )
+
+
+def needs_translation(job: dict) -> bool:
+    """任务是否还需要翻译（未从断点恢复翻译结果）"""
+    checkpoint_data = job['checkpoint_data']
+    return not checkpoint_data or checkpoint_data['stage'] in [
+        CheckpointStage.TRANSLATION, CheckpointStage.TRANSCRIPTION, CheckpointStage.AUDIO_EXTRACTION
+    ]
+
+
+def save_translation_checkpoint(job: dict, checkpoint_manager: Optional[CheckpointManager]) -> None:
+    """保存翻译完成后的断点"""
+    if not checkpoint_manager:
+        return
+    checkpoint_manager.save_checkpoint(
+        job['video_file'],
+        {
+            "audio_path": str(job['audio_path']) if job['audio_path'] else None,
+            "transcription": _dump_transcription(job['transcription']),
+            "translation": job['translation'].model_dump()
+        },
+        CheckpointStage.FORMATTING,
+        progress=75.0
+    )
+
+
+def format_stage(job: dict, settings: any, checkpoint_manager: Optional[CheckpointManager]) -> None:
+    """阶段 4：生成输出文件并清理"""
+    from src.translator.openai_translator import is_same_language
+    
+    video_file = job['video_file']
+    audio_path = job['audio_path']
+    logger.info(f"生成字幕文件: {video_file.name}")
+    
+    # 未翻译时原文与译文相同，只输出一遍
+    include_original = settings.output.include_original and not is_same_language(
+        job['transcription'].language, job['lang']
+    )
+    save_outputs(
+        job['translation'].segments,
+        job['format'],
+        job['srt_path'],
+        job['txt_path'],
+        include_original=include_original
+    )
+    
+    # 清理临时文件
+    if not settings.processing.keep_temp_files and audio_path:
+        audio_path.unlink(missing_ok=True)
+    
+    # 删除断点
+    if checkpoint_manager:
+        checkpoint_manager.remove_checkpoint(video_file)
+    
+    logger.info(f"完成: {video_file.name}")
+
+
+PIPELINE_STAGES = (extract_stage, transcribe_stage, translate_stage, format_stage)
+
+
+def job_result(job: dict, cost_calculator: CostCalculator) -> dict:
+    """计算单个视频的费用信息"""
+    transcription = job['transcription']
+    translation = job['translation']
+    
+    whisper_cost = cost_calculator.calculate_whisper_cost(transcription.duration)
+    gpt_cost = 0.0
+    if translation.input_tokens and translation.output_tokens:
+        gpt_cost = cost_calculator.calculate_gpt_cost(
+            translation.input_tokens,
+            translation.output_tokens,
+            translation.batch_input_tokens,
+            translation.batch_output_tokens
+        )
+    
+    return {
+        'whisper_cost': whisper_cost,
+        'gpt_cost': gpt_cost,
+        'duration': transcription.duration,
+        'input_tokens': translation.input_tokens or 0,
+        'output_tokens': translation.output_tokens or 0
+    }
+
+
+def run_batched_transcription(
+    video_files: List[Path],
+    lang: str,
+    format: str,
+    output_dir: Optional[Path],
+    settings: any,
+    checkpoint_manager: Optional[CheckpointManager],
+    cost_calculator: CostCalculator
+):
+    """先提取全部音频，跨文件批量识别，再合并或并发翻译后逐个输出
+    
+    所有音频会同时驻留内存，适合大量短视频。
+    
+    Yields:
+        (视频文件, 费用信息字典或异常)
+    """
+    from src.extractor.ffmpeg_extractor import AudioExtractor
+    
+    jobs = []
+    for video_file in video_files:
+        try:
+            jobs.append(create_job(video_file, lang, format, output_dir, checkpoint_manager))
+        except Exception as e:
+            logger.error(f"处理 {video_file.name} 失败: {e}")
+            yield video_file, e
+    
+    # 写临时音频文件时多个视频合并到一条 FFmpeg 命令中提取
+    if not use_audio_pipe(settings):
+        to_extract = [job for job in jobs if needs_extraction(job)]
+        if to_extract:
+            audio_paths = AudioExtractor().extract_audio_batch([job['video_file'] for job in to_extract])
+            for job, audio_path in zip(to_extract, audio_paths):
+                if isinstance(audio_path, Exception):
+                    job['error'] = audio_path
+                else:
+                    job['audio_path'] = audio_path
+    
+    extracted = []
+    for job in jobs:
+        if job['error'] is not None:
+            yield job['video_file'], job['error']
+            continue
+        try:
+            extract_stage(job, settings, checkpoint_manager)
+            extracted.append(job)
+        except Exception as e:
+            logger.error(f"处理 {job['video_file'].name} 失败: {e}")
+            yield job['video_file'], e
+    jobs = extracted
+    
+    pending = [job for job in jobs if needs_transcription(job)]
+    if pending:
+        logger.info(f"批量语音识别: {len(pending)} 个视频")
+        try:
+            results = get_transcriber().transcribe_batch([
+                job['audio_data'] if job['audio_data'] is not None else job['audio_path']
+                for job in pending
+            ])
+        except Exception as e:
+            logger.error(f"批量语音识别失败: {e}")
+            for job in pending:
+                job['error'] = e
         else:
-            # 从断点恢复翻译结果
-            from src.translator.openai_translator import TranslationResult
-            translation = TranslationResult(
-                segments=translation.segments,  # 需要保存和恢复
-                input_tokens=checkpoint_data['state'].get('input_tokens'),
-                output_tokens=checkpoint_data['state'].get('output_tokens')
-            )
-        
-        # 4. 生成输出文件
-        logger.info(f"生成字幕文件: {video_file.name}")
-        
-        if format in ['srt', 'both']:
-            srt_formatter = SRTFormatter()
-            srt_formatter.save(
-                translation.segments,
-                srt_path,
-                include_original=settings.output.include_original
-            )
-        
-        if format in ['text', 'both']:
-            text_formatter = TextFormatter()
-            text_formatter.save(
-                translation.segments,
-                txt_path,
-                include_original=settings.output.include_original
-            )
-        
-        # 清理临时文件
-        if not settings.processing.keep_temp_files and audio_path and audio_path.exists():
-            audio_path.unlink()
-        
-        # 删除断点
-        if checkpoint_manager:
-            checkpoint_manager.remove_checkpoint(video_file)
-        
-        logger.info(f"完成: {video_file.name}")
-        
-        # 计算费用
-        cost_calculator = CostCalculator(settings.api_pricing.model_dump())
-        whisper_cost = cost_calculator.calculate_whisper_cost(transcription.duration)
-        gpt_cost = 0.0
-        if translation.input_tokens and translation.output_tokens:
-            gpt_cost = cost_calculator.calculate_gpt_cost(
-                translation.input_tokens,
-                translation.output_tokens
-            )
-        
-        return {
-            'whisper_cost': whisper_cost,
-            'gpt_cost': gpt_cost,
-            'duration': transcription.duration,
-            'input_tokens': translation.input_tokens or 0,
-            'output_tokens': translation.output_tokens or 0
+            for job, transcription in zip(pending, results):
+                job['transcription'] = transcription
+                save_transcription_checkpoint(job, checkpoint_manager)
+        for job in pending:
+            job['audio_data'] = None
+        # 全部识别已完成，GPU 上的模型不再需要
+        if settings.whisper.backend == "local" and settings.whisper.device != "cpu":
+            release_transcriber()
+    
+    # 各视频的翻译互相独立，并发提交；总请求量由翻译器共享的限流器和信号量约束
+    ready = []
+    for job in jobs:
+        if job['error'] is not None:
+            yield job['video_file'], job['error']
+        else:
+            ready.append(job)
+    if not ready:
+        return
+    
+    coalesce_translations(ready, settings, checkpoint_manager)
+    
+    with ThreadPoolExecutor(
+        max_workers=min(len(ready), settings.openai.max_concurrent_requests)
+    ) as executor:
+        futures = {
+            executor.submit(_translate_job, job, settings, checkpoint_manager): job
+            for job in ready
         }
-        
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                future.result()
+                format_stage(job, settings, checkpoint_manager)
+                yield job['video_file'], job_result(job, cost_calculator)
+            except Exception as e:
+                logger.error(f"处理 {job['video_file'].name} 失败: {e}")
+                yield job['video_file'], e
+
+
+def coalesce_translations(
+    jobs: List[dict],
+    settings: any,
+    checkpoint_manager: Optional[CheckpointManager]
+) -> None:
+    """传统翻译模式下把多个视频的片段合并成共同的请求翻译
+    
+    失败时不标记错误，留给逐个视频的翻译阶段重试。
+    """
+    from src.translator.openai_translator import OpenAITranslator, is_same_language
+    
+    if settings.translation.paragraph_mode:
+        return
+    
+    pending = []
+    for job in jobs:
+        try:
+            if job['transcription'] is None:
+                transcribe_stage(job, settings, checkpoint_manager)
+        except Exception:
+            continue  # 错误由逐个视频的阶段记录
+        if needs_translation(job) and not is_same_language(job['transcription'].language, job['lang']):
+            pending.append(job)
+    if len(pending) < 2:
+        return
+    
+    logger.info(f"合并翻译 {len(pending)} 个视频")
+    try:
+        results = OpenAITranslator().translate_many([
+            (job['transcription'].segments, job['transcription'].language) for job in pending
+        ])
     except Exception as e:
-        logger.error(f"处理 {video_file.name} 失败: {e}")
-        raise
+        logger.warning(f"合并翻译失败，改为逐个翻译: {e}")
+        return
+    for job, translation in zip(pending, results):
+        job['translation'] = translation
+        save_translation_checkpoint(job, checkpoint_manager)
+
+
+def _translate_job(job: dict, settings: any, checkpoint_manager: Optional[CheckpointManager]) -> None:
+    """补做未完成的识别后翻译单个视频"""
+    if job['transcription'] is None:
+        transcribe_stage(job, settings, checkpoint_manager)
+    translate_stage(job, settings, checkpoint_manager)
+
+
+def _stage_loop(
+    stage,
+    in_queue: queue.Queue,
+    out_queue: queue.Queue,
+    settings: any,
+    checkpoint_manager: Optional[CheckpointManager],
+    peers: Optional[dict] = None
+) -> None:
+    """流水线工作线程：从上游取任务，执行本阶段后交给下游，收到 None 时结束
+    
+    同一阶段有多个线程时通过 peers 计数，None 放回队列唤醒同伴，
+    最后一个退出的线程再向下游传递 None。
+    """
+    while True:
+        job = in_queue.get()
+        if job is None:
+            if peers is not None:
+                in_queue.put(None)
+                with peers['lock']:
+                    peers['remaining'] -= 1
+                    if peers['remaining'] > 0:
+                        return
+            out_queue.put(None)
+            return
+        if job['error'] is None:
+            try:
+                stage(job, settings, checkpoint_manager)
+            except Exception as e:
+                logger.error(f"处理 {job['video_file'].name} 失败: {e}")
+                job['error'] = e
+                job['audio_data'] = None
+        out_queue.put(job)
+
+
+def run_pipeline(
+    video_files: List[Path],
+    lang: str,
+    format: str,
+    output_dir: Optional[Path],
+    settings: any,
+    checkpoint_manager: Optional[CheckpointManager],
+    cost_calculator: CostCalculator
+):
+    """按阶段流水线处理多个视频
+    
+    提取（磁盘/FFmpeg）、识别（GPU/Whisper API）各占一个线程，
+    第 N+1 个视频提取音频时第 N 个在识别、之前的视频在翻译。
+    翻译阶段受网络延迟限制，多个视频并发翻译（线程数取 max_concurrent_requests）。
+    阶段间队列容量为 2，限制内存中积压的音频数据。
+    输出阶段在调用方线程执行。
+    
+    Yields:
+        (视频文件, 费用信息字典或异常)，按完成顺序
+    """
+    input_queue: queue.Queue = queue.Queue()
+    for video_file in video_files:
+        try:
+            input_queue.put(create_job(video_file, lang, format, output_dir, checkpoint_manager))
+        except Exception as e:
+            yield video_file, e
+    input_queue.put(None)
+    
+    queues = [input_queue] + [queue.Queue(maxsize=2) for _ in PIPELINE_STAGES[:-1]]
+    threads = []
+    for i, stage in enumerate(PIPELINE_STAGES[:-1]):
+        count = 1
+        if stage is translate_stage:
+            count = max(1, min(settings.openai.max_concurrent_requests, len(video_files)))
+        peers = {'remaining': count, 'lock': threading.Lock()} if count > 1 else None
+        threads.extend(
+            threading.Thread(
+                target=_stage_loop,
+                args=(stage, queues[i], queues[i + 1], settings, checkpoint_manager, peers),
+                name=f"pipeline-{stage.__name__}-{n}",
+                daemon=True
+            )
+            for n in range(count)
+        )
+    for thread in threads:
+        thread.start()
+    
+    output_queue = queues[-1]
+    while True:
+        job = output_queue.get()
+        if job is None:
+            break
+        if job['error'] is not None:
+            yield job['video_file'], job['error']
+            continue
+        try:
+            format_stage(job, settings, checkpoint_manager)
+            yield job['video_file'], job_result(job, cost_calculator)
+        except Exception as e:
+            logger.error(f"处理 {job['video_file'].name} 失败: {e}")
+            yield job['video_file'], e
+    
+    for thread in threads:
+        thread.join()
 
 
 @cli.command()
@@ -423,6 +994,7 @@ def info():
     """显示配置信息"""
     settings = get_settings()
     click.echo("📋 当前配置:")
+    click.echo(f"  - Whisper 后端: {settings.whisper.backend}")
     click.echo(f"  - Whisper 模型: {settings.whisper.model_size}")
     click.echo(f"  - 目标语言: {settings.translation.target_language}")
     click.echo(f"  - 输出格式: {settings.output.format}")
@@ -438,6 +1010,7 @@ def info():
         click.echo(f"  - 时间戳重分配: {'启用' if settings.translation.redistribute_timestamps else '禁用'}")
     
     # 检查 FFmpeg
+    from src.extractor.ffmpeg_extractor import AudioExtractor
     extractor = AudioExtractor()
     if extractor.check_ffmpeg():
         click.echo("\n✅ FFmpeg 已安装")
@@ -4,7 +4,6 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 import yaml
 from pydantic import BaseModel, Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class OpenAIConfig(BaseModel):
@@ -13,6 +12,9 @@ class OpenAIConfig(BaseModel):
     model: str = Field(default="gpt-3.5-turbo", description="使用的模型")
     max_retries: int = Field(default=3, description="重试次数")
     timeout: int = Field(default=30, description="超时时间")
+    max_concurrent_requests: int = Field(default=5, description="最大并发请求数")
+    requests_per_minute: int = Field(default=500, description="每分钟请求数上限")
+    tokens_per_minute: int = Field(default=0, description="每分钟 token 上限（估算值），0 表示不限制")
 
     @field_validator("api_key", mode="before")
     @classmethod
@@ -25,16 +27,24 @@ class OpenAIConfig(BaseModel):
 
 class WhisperConfig(BaseModel):
     """Whisper 配置"""
+    backend: str = Field(default="api", description="识别后端（api/local）")
     model_size: str = Field(default="base", description="模型大小")
-    device: str = Field(default="cpu", description="运行设备")
-    compute_type: str = Field(default="int8", description="计算类型")
+    device: str = Field(default="cpu", description="运行设备（cpu/cuda/auto）")
+    compute_type: str = Field(default="auto", description="计算类型（auto/int8/int8_float16/float16/float32）")
+    cpu_threads: int = Field(default=0, description="CPU 推理线程数（0 为使用全部核心）")
+    batch_size: int = Field(default=8, description="本地批量推理大小（1 为逐段推理）")
     language: str = Field(default="auto", description="源语言")
+    timeout: int = Field(default=600, description="Whisper API 请求超时（秒），上传大文件需要较长时间")
 
 
 class TranslationConfig(BaseModel):
     """翻译配置"""
     target_language: str = Field(default="zh-cn", description="目标语言")
-    batch_size: int = Field(default=10, description="批量大小")
+    batch_size: int = Field(default=10, description="每批翻译的片段数上限")
+    batch_api_threshold: int = Field(
+        default=0,
+        description="未命中缓存的片段数达到该值时改用 OpenAI Batch API 离线翻译（费用减半，最长 24 小时完成），0 表示关闭"
+    )
     preserve_style: bool = Field(default=True, description="保持风格")
     target_speech_rate: int = Field(default=240, description="目标语速（字/分钟）")
     gap_duration: float = Field(default=0.5, description="句子间隔时间（秒）")
@@ -45,6 +55,10 @@ class TranslationConfig(BaseModel):
     paragraph_max_duration: float = Field(default=30.0, description="单个段落最大时长（秒）")
     paragraph_min_duration: float = Field(default=3.0, description="单个段落最小时长（秒）")
     
+    # 翻译缓存配置
+    cache_enabled: bool = Field(default=True, description="是否启用翻译缓存")
+    cache_file: str = Field(default="./.cache/translations.db", description="翻译缓存文件")
+    
     # 时间戳重分配配置
     redistribute_timestamps: bool = Field(default=True, description="是否重新分配时间戳")
     sentence_min_gap: float = Field(default=0.5, description="句子之间的最小间隔（秒）")
@@ -71,6 +85,7 @@ class ProcessingConfig(BaseModel):
     """处理配置"""
     chunk_duration: int = Field(default=300, description="分段时长")
     temp_dir: str = Field(default="./temp", description="临时目录")
+    audio_format: str = Field(default="flac", description="中间音频格式（wav/flac/opus）")
     keep_temp_files: bool = Field(default=False, description="保留临时文件")
 
 
@@ -127,27 +142,47 @@ class Settings(BaseModel):
             yaml.dump(self.model_dump(), f, default_flow_style=False)
 
 
-# 全局配置实例
+# 全局配置实例及其来源文件
 _settings: Optional[Settings] = None
+_settings_path: Optional[Path] = None
 
 
 def get_settings(config_file: Optional[Path] = None) -> Settings:
     """获取全局配置实例
     
+    同一个配置文件只解析一次，重复传入相同路径直接返回已加载的实例。
+    
     Args:
         config_file: 自定义配置文件路径
     """
-    global _settings
-    if _settings is None or config_file is not None:
-        config_path = config_file if config_file else Path("config.yaml")
-        _settings = Settings.load_from_file(config_path)
+    global _settings, _settings_path
+    if config_file is not None:
+        config_path = Path(config_file).resolve()
+        if _settings is None or config_path != _settings_path:
+            _settings = Settings.load_from_file(config_path)
+            _settings_path = config_path
+    elif _settings is None:
+        _settings_path = Path("config.yaml").resolve()
+        _settings = Settings.load_from_file(_settings_path)
     return _settings
 
 
 def reload_settings(config_path: Optional[Path] = None) -> Settings:
     """重新加载配置"""
-    global _settings
+    global _settings, _settings_path
     if config_path is None:
         config_path = Path("config.yaml")
-    _settings = Settings.load_from_file(config_path)
-    return _settings
\ No newline at end of file
+    _settings_path = Path(config_path).resolve()
+    _settings = Settings.load_from_file(_settings_path)
+    return _settings
+
+
+def set_settings(settings: Settings) -> Settings:
+    """替换全局配置实例
+
+    用于在子进程中恢复父进程（含命令行覆盖项）的配置。
+    """
+    global _settings, _settings_path
+    _settings = settings
+    _settings_path = None
+    return _settings
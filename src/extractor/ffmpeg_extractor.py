@@ -1,7 +1,11 @@
 """音频提取模块 - 使用 FFmpeg 从视频中提取音频"""
+import os
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
 import ffmpeg
 from ..utils.exceptions import ConfigurationError, FileProcessingError, AudioExtractionError
 from src.utils.helpers import setup_logger, ensure_dir, get_output_path
@@ -10,22 +14,109 @@ from src.config.settings import get_settings
 
 logger = setup_logger(__name__)
 
+# FFmpeg 找不到指定音频流时的错误信息
+NO_AUDIO_STREAM_ERROR = "matches no streams"
+
+# 从管道读取 PCM 数据的块大小，同时用作 Python 端的读缓冲大小（不改变操作系统的管道容量），
+# 较大的块减少 read 调用和数组转换的次数
+PIPE_BUFFER_SIZE = 1 << 20
+
+# 中间音频格式：名称 -> (文件后缀, FFmpeg 编码参数)
+# FLAC 无损且约为 PCM 的一半大小，Opus 24kbps 体积最小；Whisper API 和 faster-whisper 都能直接读取
+AUDIO_FORMATS = {
+    'wav': ('.wav', {'acodec': 'pcm_s16le'}),
+    'flac': ('.flac', {'acodec': 'flac'}),
+    'opus': ('.ogg', {'acodec': 'libopus', 'audio_bitrate': '24k'}),
+}
+
+# 限制输入探测量：默认最多分析 5 秒输入才开始解码，只取音频时不需要这么多；
+# 个别封装探测不到音频流时会以默认参数重试
+FAST_PROBE_ARGS = {'probesize': '500K', 'analyzeduration': 0}
+
+# 管道输出时的编码参数：单声道 16 位 PCM 裸流
+PCM_STREAM_ARGS = {'format': 's16le', 'acodec': 'pcm_s16le'}
+
+# 编译 argv 模板时使用的占位路径，调用时替换为实际的输入输出
+_INPUT_PLACEHOLDER = '<input>'
+_OUTPUT_PLACEHOLDER = '<output>'
+
+
+@lru_cache(maxsize=64)
+def _argv_template(sample_rate: int, codec_items: tuple, fast_probe: bool) -> tuple:
+    """单文件音频提取的 FFmpeg 命令模板
+    
+    参数组合只有少数几种，用 ffmpeg-python 编译一次后缓存，
+    之后每次调用只替换输入输出路径，不再重建节点图。
+    """
+    return tuple(
+        ffmpeg.output(
+            ffmpeg.input(_INPUT_PLACEHOLDER, **(FAST_PROBE_ARGS if fast_probe else {}))['a:0'],
+            _OUTPUT_PLACEHOLDER,
+            vn=None,             # 只映射音频流，不建立视频解码
+            ar=sample_rate,      # 采样率
+            ac=1,                # 单声道
+            loglevel='error',
+            **dict(codec_items)
+        ).overwrite_output().compile()
+    )
+
+
+def _extract_argv(
+    video_path: Path,
+    output: str,
+    sample_rate: int,
+    codec_args: Dict[str, str],
+    fast_probe: bool = True
+) -> List[str]:
+    """生成单文件音频提取的 FFmpeg 命令行"""
+    template = _argv_template(sample_rate, tuple(codec_args.items()), fast_probe)
+    substitutions = {_INPUT_PLACEHOLDER: str(video_path), _OUTPUT_PLACEHOLDER: output}
+    return [substitutions.get(arg, arg) for arg in template]
+
+
+def _run_ffmpeg(argv: List[str]) -> None:
+    """运行 FFmpeg 命令，失败时抛出与 ffmpeg.run 相同的 ffmpeg.Error"""
+    result = subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise ffmpeg.Error('ffmpeg', None, result.stderr)
+
+
+@lru_cache(maxsize=256)
+def _probe_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """ffprobe 结果缓存，文件修改时间或大小变化后自动失效
+    
+    返回值在多个调用方之间共享，不要修改。
+    """
+    return ffmpeg.probe(path)
+
+
+def probe(video_path: Path) -> Dict[str, Any]:
+    """获取 ffprobe 信息，同一文件只探测一次"""
+    st = video_path.stat()
+    return _probe_cached(str(video_path), st.st_mtime_ns, st.st_size)
+
 
 class AudioExtractor:
     """音频提取器"""
     
+    # FFmpeg 检测成功后在进程内复用结果，批量处理时不再为每个视频启动一次 ffmpeg -version
+    _ffmpeg_available = False
+    
     def __init__(self):
         self.settings = get_settings()
         self.temp_dir = ensure_dir(self.settings.processing.temp_dir)
     
     def check_ffmpeg(self) -> bool:
         """检查 FFmpeg 是否已安装"""
+        if AudioExtractor._ffmpeg_available:
+            return True
         try:
             subprocess.run(
                 ["ffmpeg", "-version"], 
                 capture_output=True, 
                 check=True
             )
+            AudioExtractor._ffmpeg_available = True
             return True
         except (subprocess.CalledProcessError, FileNotFoundError):
             logger.error("FFmpeg 未安装或不在 PATH 中")
@@ -34,19 +125,19 @@ class AudioExtractor:
     def get_video_info(self, video_path: Path) -> Dict[str, Any]:
         """获取视频信息"""
         try:
-            probe = ffmpeg.probe(str(video_path))
+            probe_data = probe(video_path)
             video_info = next(
-                (s for s in probe['streams'] if s['codec_type'] == 'video'), 
+                (s for s in probe_data['streams'] if s['codec_type'] == 'video'), 
                 None
             )
             audio_info = next(
-                (s for s in probe['streams'] if s['codec_type'] == 'audio'), 
+                (s for s in probe_data['streams'] if s['codec_type'] == 'audio'), 
                 None
             )
             
             return {
-                'duration': float(probe['format']['duration']),
-                'size': int(probe['format']['size']),
+                'duration': float(probe_data['format']['duration']),
+                'size': int(probe_data['format']['size']),
                 'video_codec': video_info['codec_name'] if video_info else None,
                 'audio_codec': audio_info['codec_name'] if audio_info else None,
                 'has_audio': audio_info is not None
@@ -74,49 +165,264 @@ class AudioExtractor:
         if not self.check_ffmpeg():
             raise ConfigurationError("FFmpeg 未安装或不在 PATH 中", config_key="ffmpeg")
         
-        if not video_path.exists():
-            raise FileProcessingError(f"视频文件不存在: {video_path}", file_path=str(video_path))
-        
-        # 获取视频信息
-        info = self.get_video_info(video_path)
-        if not info.get('has_audio', False):
-            raise AudioExtractionError(f"视频文件没有音频流: {video_path}", video_path=str(video_path))
-        
         # 设置输出路径
         if output_path is None:
-            output_path = self.temp_dir / f"{video_path.stem}.wav"
+            output_path = self.temp_dir / f"{video_path.stem}{self._audio_format()[0]}"
         else:
             ensure_dir(output_path.parent)
+        codec_args = self._codec_args(output_path)
         
         logger.info(f"开始提取音频: {video_path}")
-        logger.info(f"视频时长: {info.get('duration', 0):.1f}秒")
         
         try:
-            # 使用 ffmpeg-python 构建命令
-            stream = ffmpeg.input(str(video_path))
-            stream = ffmpeg.output(
-                stream, 
-                str(output_path),
-                acodec='pcm_s16le',  # WAV 格式
-                ar=sample_rate,      # 采样率
-                ac=1,                # 单声道
-                loglevel='error'
+            # 不再预先 ffprobe：直接选取第一条音频流，没有音频时由 FFmpeg 报错
+            self._run_with_fast_probe(
+                lambda fast_probe: _extract_argv(
+                    video_path, str(output_path), sample_rate, codec_args, fast_probe
+                )
             )
-            ffmpeg.run(stream, overwrite_output=True)
             
             logger.info(f"音频提取成功: {output_path}")
             return output_path
             
         except ffmpeg.Error as e:
-            logger.error(f"音频提取失败: {e.stderr.decode()}")
+            self._check_exists(video_path)
+            stderr = e.stderr.decode(errors='ignore') if e.stderr else ""
+            if NO_AUDIO_STREAM_ERROR in stderr:
+                raise AudioExtractionError(f"视频文件没有音频流: {video_path}", video_path=str(video_path)) from e
+            logger.error(f"音频提取失败: {stderr}")
             raise AudioExtractionError(f"音频提取失败: {e}", video_path=str(video_path)) from e
     
+    def _check_exists(self, video_path: Path) -> None:
+        """FFmpeg 失败后再确认输入是否存在，给出明确的错误
+        
+        正常路径不预先检查：输入都来自目录扫描或已校验的参数，省去每个文件一次 stat。
+        """
+        if not video_path.exists():
+            raise FileProcessingError(f"视频文件不存在: {video_path}", file_path=str(video_path))
+    
+    def _run_with_fast_probe(self, build) -> None:
+        """先以受限的输入探测参数运行 FFmpeg，失败时用默认参数重试
+        
+        Args:
+            build: 接收 fast_probe 标志、返回 FFmpeg 命令行的函数
+        """
+        try:
+            _run_ffmpeg(build(True))
+        except ffmpeg.Error as e:
+            logger.debug(f"快速探测失败，使用默认探测参数重试: {e}")
+            _run_ffmpeg(build(False))
+    
+    def extract_audio_batch(
+        self,
+        video_paths: List[Path],
+        sample_rate: int = 16000,
+        group_size: int = 8,
+        output_paths: Optional[List[Path]] = None,
+        max_workers: Optional[int] = None
+    ) -> List[Union[Path, Exception]]:
+        """用少量 FFmpeg 调用提取多个视频的音频
+        
+        每 group_size 个视频合成一条命令（多个 -i 输入，每个输入 -map 到各自的 WAV），
+        批量处理短视频时省去每个文件单独启动 ffprobe 和 ffmpeg 的开销。
+        各组之间并行运行。某组失败时逐个回退到 extract_audio，以便定位出错的文件。
+        
+        Args:
+            video_paths: 视频文件路径列表
+            sample_rate: 采样率，Whisper 需要 16kHz
+            group_size: 每条命令最多处理的视频数
+            output_paths: 与 video_paths 对应的输出路径，默认写入临时目录
+            max_workers: 同时运行的 FFmpeg 进程数，默认 CPU 核数
+            
+        Returns:
+            与输入顺序一致的音频路径，提取失败的位置为对应异常
+        """
+        if not self.check_ffmpeg():
+            raise ConfigurationError("FFmpeg 未安装或不在 PATH 中", config_key="ffmpeg")
+        
+        if output_paths is None:
+            output_paths = self._batch_output_paths(video_paths)
+        elif len(output_paths) != len(video_paths):
+            raise ValueError("output_paths 与 video_paths 数量不一致")
+        
+        # 文件较少时缩小每组的规模，让每个核都分到一组
+        max_workers = max_workers or os.cpu_count() or 1
+        group_size = max(1, min(group_size, -(-len(video_paths) // max_workers)))
+        groups = [
+            (video_paths[i:i + group_size], output_paths[i:i + group_size])
+            for i in range(0, len(video_paths), group_size)
+        ]
+        workers = min(len(groups), max_workers)
+        if workers <= 1:
+            group_results = [self._extract_group(*group, sample_rate) for group in groups]
+        else:
+            # 每组是一个独立的 FFmpeg 进程，线程只负责等待，多组并行即可用满多核
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                group_results = list(executor.map(
+                    lambda group: self._extract_group(*group, sample_rate), groups
+                ))
+        return [result for results in group_results for result in results]
+    
+    def _extract_group(
+        self,
+        group: List[Path],
+        group_outputs: List[Path],
+        sample_rate: int
+    ) -> List[Union[Path, Exception]]:
+        """用一条 FFmpeg 命令提取一组视频的音频，失败时逐个回退"""
+        logger.info(f"批量提取音频: {len(group)} 个视频")
+        try:
+            streams = [
+                ffmpeg.output(
+                    ffmpeg.input(str(video_path), **FAST_PROBE_ARGS)['a:0'],
+                    str(output_path),
+                    vn=None,
+                    ar=sample_rate,
+                    ac=1,
+                    **self._codec_args(output_path)
+                )
+                for video_path, output_path in zip(group, group_outputs)
+            ]
+            ffmpeg.run(
+                ffmpeg.merge_outputs(*streams).global_args('-loglevel', 'error'),
+                overwrite_output=True,
+                capture_stderr=True
+            )
+            return list(group_outputs)
+        except ffmpeg.Error as e:
+            logger.warning(f"批量提取失败，逐个重试: {e.stderr.decode(errors='ignore').strip()}")
+        
+        results: List[Union[Path, Exception]] = []
+        for video_path, output_path in zip(group, group_outputs):
+            try:
+                results.append(self.extract_audio(
+                    video_path, output_path=output_path, sample_rate=sample_rate
+                ))
+            except Exception as err:
+                results.append(err)
+        return results
+    
+    def _audio_format(self) -> tuple:
+        """配置的中间音频格式 (后缀, 编码参数)"""
+        audio_format = self.settings.processing.audio_format
+        if audio_format not in AUDIO_FORMATS:
+            raise ConfigurationError(
+                f"不支持的音频格式: {audio_format}（可选: {', '.join(AUDIO_FORMATS)}）",
+                config_key="processing.audio_format"
+            )
+        return AUDIO_FORMATS[audio_format]
+    
+    def _codec_args(self, output_path: Path) -> Dict[str, str]:
+        """按输出文件后缀选择编码参数，无法识别的后缀使用配置的格式"""
+        suffix = output_path.suffix.lower()
+        for format_suffix, codec_args in AUDIO_FORMATS.values():
+            if suffix == format_suffix:
+                return codec_args
+        return self._audio_format()[1]
+    
+    def _batch_output_paths(self, video_paths: List[Path]) -> List[Path]:
+        """为批量提取生成临时音频路径
+        
+        不同目录下的同名视频追加序号，避免同一条命令写入同一个输出文件。
+        """
+        suffix = self._audio_format()[0]
+        seen = set()
+        paths = []
+        for video_path in video_paths:
+            name = video_path.stem
+            n = 1
+            while name in seen:
+                name = f"{video_path.stem}_{n}"
+                n += 1
+            seen.add(name)
+            paths.append(self.temp_dir / f"{name}{suffix}")
+        return paths
+    
+    def extract_audio_stream(
+        self,
+        video_path: Path,
+        sample_rate: int = 16000,
+        fast_probe: bool = True,
+        stderr=subprocess.DEVNULL
+    ) -> subprocess.Popen:
+        """启动 FFmpeg，把音频以 16 位 PCM 流输出到 stdout
+        
+        调用方从 proc.stdout 分块读取，读完后检查 proc.wait() 的返回码。
+        
+        Args:
+            video_path: 视频文件路径
+            sample_rate: 采样率，Whisper 需要 16kHz
+            fast_probe: 是否限制输入探测量
+            stderr: FFmpeg 错误输出的去向，默认丢弃。不要传 subprocess.PIPE 后只读 stdout：
+                错误信息写满管道缓冲后 FFmpeg 会阻塞，stdout 也就永远读不到结束
+            
+        Returns:
+            FFmpeg 进程，stdout 为单声道 s16le 数据
+        """
+        args = _extract_argv(video_path, 'pipe:1', sample_rate, PCM_STREAM_ARGS, fast_probe)
+        return subprocess.Popen(
+            args, stdout=subprocess.PIPE, stderr=stderr, bufsize=PIPE_BUFFER_SIZE
+        )
+    
+    def extract_audio_array(self, video_path: Path, sample_rate: int = 16000):
+        """从视频中提取音频到内存，不写临时文件
+        
+        边读取 FFmpeg 管道输出边转换为 Whisper 需要的 float32 数组，
+        转换与解码重叠进行，也不需要先缓存完整的 PCM 字节串。
+        
+        Args:
+            video_path: 视频文件路径
+            sample_rate: 采样率，Whisper 需要 16kHz
+            
+        Returns:
+            单声道 float32 音频数组，取值范围 [-1, 1]
+        """
+        import numpy as np
+        
+        logger.info(f"开始提取音频到内存: {video_path}")
+        for fast_probe in (True, False):
+            # 错误输出写入临时文件，进程结束后再读取，避免与 stdout 管道互相阻塞
+            with tempfile.TemporaryFile() as stderr_file:
+                proc = self.extract_audio_stream(
+                    video_path, sample_rate, fast_probe=fast_probe, stderr=stderr_file
+                )
+                chunks = []
+                with proc:
+                    while True:
+                        data = proc.stdout.read(PIPE_BUFFER_SIZE)
+                        if not data:
+                            break
+                        chunks.append(np.frombuffer(data, np.int16).astype(np.float32) / 32768.0)
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode(errors='ignore')
+            if proc.returncode == 0:
+                break
+            logger.debug(f"音频提取失败 (fast_probe={fast_probe}): {stderr}")
+        else:
+            self._check_exists(video_path)
+            if NO_AUDIO_STREAM_ERROR in stderr:
+                raise AudioExtractionError(f"视频文件没有音频流: {video_path}", video_path=str(video_path))
+            logger.error(f"音频提取失败: {stderr}")
+            raise AudioExtractionError(f"音频提取失败: {stderr.strip()}", video_path=str(video_path))
+        
+        if not chunks:
+            raise AudioExtractionError(f"视频文件没有音频流: {video_path}", video_path=str(video_path))
+        
+        audio = np.concatenate(chunks)
+        logger.info(f"音频提取成功: {len(audio) / sample_rate:.1f}秒")
+        return audio
+    
     def cleanup_temp_files(self):
         """清理临时文件"""
         if not self.settings.processing.keep_temp_files:
-            for file in self.temp_dir.glob("*.wav"):
-                try:
-                    file.unlink()
-                    logger.debug(f"删除临时文件: {file}")
-                except Exception as e:
-                    logger.warning(f"删除临时文件失败: {file}, {e}")
\ No newline at end of file
+            # os.scandir 不为每个条目构造 Path，先按后缀过滤再判断类型
+            suffixes = tuple({suffix for suffix, _ in AUDIO_FORMATS.values()})
+            with os.scandir(self.temp_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.endswith(suffixes) and entry.is_file()):
+                        continue
+                    try:
+                        os.unlink(entry.path)
+                        logger.debug(f"删除临时文件: {entry.path}")
+                    except OSError as e:
+                        logger.warning(f"删除临时文件失败: {entry.path}, {e}")
\ No newline at end of file
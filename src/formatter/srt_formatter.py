@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import List, Optional
 
 from ..translator.openai_translator import TranslationSegment
+from ..utils.helpers import ensure_dir_once
 from ..config.settings import get_settings
 
 
@@ -33,33 +34,27 @@ class SRTFormatter:
         if not segments:
             return ""
         
-        srt_lines = []
+        # 每个片段拼成一个完整的块，最后一次 join
+        blocks = []
+        format_timestamp = self._format_timestamp
+        validate_text = self._validate_text
+        gap_duration = self.gap_duration
         
         for idx, segment in enumerate(segments, 1):
-            # 序号
-            srt_lines.append(str(idx))
-            
-            # 时间戳（结束时间减去间隔）
-            start_time = self._format_timestamp(segment.start)
-            # 确保结束时间不小于开始时间
-            adjusted_end = max(segment.start + 0.1, segment.end - self.gap_duration)
-            end_time = self._format_timestamp(adjusted_end)
-            srt_lines.append(f"{start_time} --> {end_time}")
+            # 时间戳（结束时间减去间隔，且不小于开始时间）
+            start_time = format_timestamp(segment.start)
+            end_time = format_timestamp(max(segment.start + 0.1, segment.end - gap_duration))
             
             # 内容（验证并清理）
             if include_original:
-                # 验证原文
-                original_text = self._validate_text(segment.original, f"segment {idx} original")
-                srt_lines.append(original_text)
-                
-            # 验证翻译文本
-            translated_text = self._validate_text(segment.translated, f"segment {idx} translated")
-            srt_lines.append(translated_text)
-            
-            # 空行分隔
-            srt_lines.append("")
+                original_text = validate_text(segment.original, f"segment {idx} original")
+                translated_text = validate_text(segment.translated, f"segment {idx} translated")
+                blocks.append(f"{idx}\n{start_time} --> {end_time}\n{original_text}\n{translated_text}\n")
+            else:
+                translated_text = validate_text(segment.translated, f"segment {idx} translated")
+                blocks.append(f"{idx}\n{start_time} --> {end_time}\n{translated_text}\n")
         
-        return "\n".join(srt_lines)
+        return "\n".join(blocks)
     
     def save(
         self,
@@ -77,7 +72,7 @@ class SRTFormatter:
         srt_content = self.format(segments, include_original)
         
         # 确保目录存在
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir_once(output_path.parent)
         
         # 写入文件
         with open(output_path, "w", encoding="utf-8") as f:
@@ -94,13 +89,13 @@ class SRTFormatter:
         Returns:
             SRT 时间戳格式 (HH:MM:SS,mmm)
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        whole_secs = int(secs)
-        millis = int((secs - whole_secs) * 1000)
+        # 先取整到毫秒再用整数 divmod 拆分，避免浮点误差（如 1.001 变成 1,000）
+        total_millis = max(0, round(seconds * 1000))
+        total_secs, millis = divmod(total_millis, 1000)
+        minutes, secs = divmod(total_secs, 60)
+        hours, minutes = divmod(minutes, 60)
         
-        return f"{hours:02d}:{minutes:02d}:{whole_secs:02d},{millis:03d}"
+        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
     
     def _validate_text(self, text: str, context: str = "") -> str:
         """验证和清理文本内容
@@ -1,9 +1,10 @@
 """文本格式化模块"""
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from ..translator.openai_translator import TranslationSegment
+from ..utils.helpers import ensure_dir_once
 
 
 class TextFormatter:
@@ -27,22 +28,31 @@ class TextFormatter:
         Returns:
             格式化的文本
         """
-        if not segments:
-            return ""
-        
-        lines = []
+        return "\n".join(self._iter_lines(segments, include_original))
+    
+    def _iter_lines(
+        self,
+        segments: List[TranslationSegment],
+        include_original: bool = True
+    ) -> Iterator[str]:
+        """逐行生成文本内容（不含换行符）
         
+        Args:
+            segments: 翻译片段列表
+            include_original: 是否包含原文
+            
+        Yields:
+            文本行
+        """
         for segment in segments:
             if include_original:
                 # 原文译文对照格式
-                lines.append(segment.original)
-                lines.append(segment.translated)
-                lines.append("")  # 空行分隔
+                yield segment.original
+                yield segment.translated
+                yield ""  # 空行分隔
             else:
                 # 仅译文
-                lines.append(segment.translated)
-        
-        return "\n".join(lines)
+                yield segment.translated
     
     def save(
         self,
@@ -57,14 +67,19 @@ class TextFormatter:
             output_path: 输出文件路径
             include_original: 是否包含原文
         """
-        text_content = self.format(segments, include_original)
-        
         # 确保目录存在
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir_once(output_path.parent)
         
-        # 写入文件
+        # 逐行流式写入，不在内存中拼接完整文档；
+        # 换行符写在行首（首行除外），结果与 format() 完全一致
+        lines = self._iter_lines(segments, include_original)
         with open(output_path, "w", encoding="utf-8") as f:
-            f.write(text_content)
+            first = next(lines, None)
+            if first is not None:
+                f.write(first)
+                for line in lines:
+                    f.write("\n")
+                    f.write(line)
         
         self.logger.info(f"Text file saved: {output_path}")
     
@@ -107,7 +122,7 @@ class TextFormatter:
         Returns:
             格式化的时间戳 (HH:MM:SS)
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
+        # 一次取整后用整数 divmod 拆分，不再对浮点数重复取模
+        minutes, secs = divmod(max(0, int(seconds)), 60)
+        hours, minutes = divmod(minutes, 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
\ No newline at end of file
@@ -0,0 +1,402 @@
+"""本地 Whisper 推理后端 - 基于 faster-whisper (CTranslate2)"""
+import bisect
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from tqdm import tqdm
+
+from ..config.settings import WhisperConfig
+from ..utils.exceptions import ConfigurationError, TranscriptionError
+
+
+# 采样率与 Whisper 单个窗口时长
+SAMPLE_RATE = 16000
+WINDOW_SECONDS = 30
+
+# 跨文件批量识别时同时解码的音频文件数
+AUDIO_DECODE_WORKERS = 4
+
+# VAD 判定为语音间隔的最短静音（毫秒），比默认的 2 秒更细，去掉更多句间停顿
+VAD_MIN_SILENCE_MS = 500
+
+# 已加载的模型，按 (model_size, device, compute_type, cpu_threads) 复用，避免同一进程内重复加载
+_MODEL_CACHE: Dict[Tuple[str, str, str, int], Any] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+class FasterWhisperBackend:
+    """faster-whisper 推理后端
+
+    使用 CTranslate2 运行量化后的 Whisper 模型：
+    CPU 上使用 int8，GPU 上使用 int8_float16（不支持时为 float16）。
+    """
+
+    def __init__(self, config: WhisperConfig):
+        """初始化并加载模型
+
+        Args:
+            config: Whisper 配置
+        """
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+
+        try:
+            from faster_whisper import BatchedInferencePipeline
+        except ImportError as e:
+            raise ConfigurationError(
+                "本地识别需要安装 faster-whisper: pip install faster-whisper",
+                config_key="whisper.backend"
+            ) from e
+
+        self.device, self.compute_type = self._resolve_device()
+        self.model = self._load_model()
+
+        # 批量推理：把 30 秒窗口拼成 batch 一次送入解码器
+        self.batched_model = None
+        if config.batch_size > 1:
+            self.batched_model = BatchedInferencePipeline(model=self.model)
+
+    @classmethod
+    def warmup(cls, config: WhisperConfig) -> None:
+        """预加载模型到进程级缓存
+
+        批量处理前调用，后续文件创建后端时直接复用已加载的模型。
+
+        Args:
+            config: Whisper 配置
+        """
+        cls(config)
+
+    @classmethod
+    def release(cls, key: Optional[Tuple[str, str, str, int]] = None) -> None:
+        """释放进程级缓存中的模型
+
+        长时间运行的进程切换模型时调用，及时归还显存/内存。
+
+        Args:
+            key: 要释放的模型键 (model_size, device, compute_type, cpu_threads)，None 为全部释放
+        """
+        import gc
+
+        with _MODEL_CACHE_LOCK:
+            if key is None:
+                _MODEL_CACHE.clear()
+            else:
+                _MODEL_CACHE.pop(key, None)
+        gc.collect()
+
+        # GPU 梅尔频谱由 torch 计算，同时归还 torch 缓存的显存
+        try:
+            import torch
+        except ImportError:
+            return
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _load_model(self):
+        """加载模型，已加载过的直接从缓存返回"""
+        from faster_whisper import WhisperModel
+
+        # CTranslate2 在 CPU 上默认只用 4 个线程，未配置时使用全部核心
+        cpu_threads = self.config.cpu_threads
+        if cpu_threads <= 0 and self.device == "cpu":
+            cpu_threads = os.cpu_count() or 0
+
+        key = (self.config.model_size, self.device, self.compute_type, cpu_threads)
+        with _MODEL_CACHE_LOCK:
+            model = _MODEL_CACHE.get(key)
+            if model is not None:
+                self.logger.debug(f"复用已加载的 Whisper 模型: {key}")
+                return model
+
+            self.logger.info(
+                f"加载本地 Whisper 模型: {self.config.model_size} "
+                f"(device={self.device}, compute_type={self.compute_type}, cpu_threads={cpu_threads})"
+            )
+            self.model = WhisperModel(
+                self.config.model_size,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=cpu_threads
+            )
+            if self.device == "cuda":
+                self._use_gpu_features()
+            _MODEL_CACHE[key] = self.model
+            return self.model
+
+    def _use_gpu_features(self) -> None:
+        """把梅尔频谱计算移到 GPU，未安装 torch 时保持 CPU 实现"""
+        try:
+            from .mel_features import TorchFeatureExtractor
+        except ImportError:
+            self.logger.info("未安装 torch，梅尔频谱在 CPU 上计算")
+            return
+
+        base = self.model.feature_extractor
+        self.model.feature_extractor = TorchFeatureExtractor(
+            device=self.device,
+            feature_size=base.mel_filters.shape[0],
+            sampling_rate=base.sampling_rate,
+            hop_length=base.hop_length,
+            chunk_length=base.chunk_length,
+            n_fft=base.n_fft
+        )
+        self.logger.info("梅尔频谱使用 GPU 计算")
+
+    def _resolve_device(self) -> Tuple[str, str]:
+        """解析运行设备和计算类型
+
+        Returns:
+            (device, compute_type)
+        """
+        device = self.config.device
+        if device == "auto":
+            import ctranslate2
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+        compute_type = self.config.compute_type
+        if compute_type == "auto":
+            compute_type = self._auto_compute_type(device)
+        return device, compute_type
+
+    @staticmethod
+    def _auto_compute_type(device: str) -> str:
+        """按设备选择计算类型
+
+        GPU 支持 int8 张量核心时使用 int8 权重 + float16 激活：
+        解码受显存带宽限制，int8 权重使每个 token 读取的数据量和显存占用都约减半，精度与 float16 相当。
+        不支持时退回 float16；CPU 上使用 int8。
+        """
+        if device != "cuda":
+            return "int8"
+        import ctranslate2
+        if "int8_float16" in ctranslate2.get_supported_compute_types("cuda"):
+            return "int8_float16"
+        return "float16"
+
+    def transcribe(self, audio: Union[Path, Any]):
+        """转录音频
+
+        Args:
+            audio: 音频文件路径，或 16kHz 单声道 float32 音频数组
+
+        Returns:
+            转录结果
+        """
+        from .whisper_transcriber import TranscriptionResult
+
+        audio_path = str(audio) if isinstance(audio, Path) else None
+        self.logger.info(f"开始本地识别: {audio_path or '内存音频'}")
+
+        language = self.config.language
+        try:
+            audio = self._load_audio(audio)
+            segments_iter, info = self._run_model(
+                audio, None if language == "auto" else language
+            )
+            segments = self._collect_segments(segments_iter, info.duration)
+        except Exception as e:
+            self.logger.error(f"本地识别失败: {e}")
+            raise TranscriptionError(f"本地识别失败: {e}", audio_path=audio_path) from e
+
+        return TranscriptionResult(
+            text=" ".join(seg.text for seg in segments),
+            segments=segments,
+            language=info.language,
+            duration=info.duration
+        )
+
+    def _collect_segments(self, segments_iter, total_duration: float) -> list:
+        """消费片段生成器，按已识别的音频时长更新进度
+
+        Args:
+            segments_iter: faster-whisper 片段生成器
+            total_duration: 音频总时长（秒）
+
+        Returns:
+            转录片段列表
+        """
+        from .whisper_transcriber import TranscriptionSegment
+
+        segments = []
+        # 非终端输出时禁用进度条（disable=None）
+        with tqdm(
+            total=round(total_duration, 1), desc="语音识别", unit="秒", leave=False, disable=None
+        ) as pbar:
+            for seg in segments_iter:
+                segments.append(
+                    TranscriptionSegment(text=seg.text.strip(), start=seg.start, end=seg.end)
+                )
+                pbar.update(round(min(seg.end, total_duration) - pbar.n, 1))
+        return segments
+
+    def _run_model(self, audio, language):
+        """选择批量或逐段推理
+
+        不足一个窗口的短音频批量没有收益，走逐段路径。
+
+        Args:
+            audio: 16kHz 单声道音频数组
+            language: 源语言，None 为自动检测
+
+        Returns:
+            (片段迭代器, 识别信息)
+        """
+        duration = len(audio) / SAMPLE_RATE
+        if self.batched_model is None or duration < WINDOW_SECONDS:
+            return self.model.transcribe(
+                audio, language=language, beam_size=5,
+                vad_filter=True, vad_parameters={"min_silence_duration_ms": VAD_MIN_SILENCE_MS}
+            )
+
+        self.logger.info(f"批量推理: batch_size={self.config.batch_size}")
+        return self.batched_model.transcribe(
+            audio,
+            language=language,
+            batch_size=self.config.batch_size,
+            beam_size=5
+        )
+
+    def transcribe_batch(self, audios: List[Union[Path, Any]]) -> list:
+        """跨文件批量识别
+
+        先对每个文件做 VAD 切分，再把所有文件的语音片段拼成一个流，
+        以 batch_size 为单位送入解码器，短视频也能填满批次。
+        自动检测语言时按语言分组，每组单独解码。
+
+        Args:
+            audios: 音频文件路径或 16kHz 单声道 float32 音频数组列表
+
+        Returns:
+            与输入顺序一致的转录结果列表
+        """
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        if self.batched_model is None or len(audios) < 2:
+            return [self.transcribe(audio) for audio in audios]
+
+        self.logger.info(f"跨文件批量识别: {len(audios)} 个音频")
+        try:
+            # 语音区间不超过一个窗口，保证一个解码窗口不会跨越两个文件
+            vad_options = VadOptions(max_speech_duration_s=WINDOW_SECONDS, min_silence_duration_ms=160)
+
+            # 音频解码（PyAV，释放 GIL）在线程池中并行进行，
+            # 主线程按顺序取出已解码的音频做 VAD 和语言检测，与后续文件的解码重叠；
+            # 每个文件的 VAD 结果同时用于语言检测和解码切分，只计算一次
+            arrays = []
+            speeches = []
+            groups: Dict[Optional[str], List[int]] = {}
+            with ThreadPoolExecutor(max_workers=min(AUDIO_DECODE_WORKERS, len(audios))) as executor:
+                for idx, audio in enumerate(executor.map(self._load_audio, audios)):
+                    speech = get_speech_timestamps(audio, vad_options)
+                    arrays.append(audio)
+                    speeches.append(speech)
+                    groups.setdefault(self._batch_language(audio, speech), []).append(idx)
+
+            results: List[Any] = [None] * len(arrays)
+            for language, indices in groups.items():
+                group_results = self._transcribe_group(
+                    [arrays[i] for i in indices], [speeches[i] for i in indices],
+                    language, vad_options
+                )
+                for idx, result in zip(indices, group_results):
+                    results[idx] = result
+        except Exception as e:
+            self.logger.error(f"批量识别失败: {e}")
+            raise TranscriptionError(f"批量识别失败: {e}") from e
+        return results
+
+    @staticmethod
+    def _load_audio(audio: Union[Path, Any]):
+        """文件路径解码为 16kHz 单声道数组，已是数组的直接返回"""
+        if not isinstance(audio, Path):
+            return audio
+        from faster_whisper import decode_audio
+        return decode_audio(str(audio), sampling_rate=SAMPLE_RATE)
+
+    def _batch_language(self, audio, speech: List[dict]) -> Optional[str]:
+        """确定批量识别时单个文件的语言，未配置时逐个检测
+
+        Args:
+            audio: 音频数组
+            speech: 该文件的 VAD 语音区间，只取开头一个窗口的语音做检测，不再重复 VAD
+        """
+        if self.config.language != "auto":
+            return self.config.language
+
+        import numpy as np
+
+        window = self.model.feature_extractor.n_samples
+        chunks = []
+        collected = 0
+        for chunk in speech:
+            chunks.append(audio[chunk["start"]:chunk["end"]])
+            collected += chunk["end"] - chunk["start"]
+            if collected >= window:
+                break
+        # VAD 没有检出语音时退回用开头一个窗口检测，不对空数组（只有填充静音）做检测
+        speech_audio = np.concatenate(chunks) if chunks else audio[:window]
+        language, _, _ = self.model.detect_language(speech_audio)
+        return language
+
+    def _transcribe_group(
+        self,
+        arrays: list,
+        speeches: List[List[dict]],
+        language: str,
+        vad_options
+    ) -> list:
+        """把同一语言的多个音频拼接后一次批量解码，再按偏移量拆回各文件
+
+        Args:
+            arrays: 音频数组列表
+            speeches: 与 arrays 对应的 VAD 语音区间
+            language: 语言代码
+            vad_options: 产生 speeches 的 VAD 参数，用于合并相邻区间
+
+        Returns:
+            转录结果列表
+        """
+        import numpy as np
+        from faster_whisper.vad import merge_segments
+        from .whisper_transcriber import TranscriptionResult
+
+        # 每个文件的语音区间单独合并，保证一个解码窗口不会跨越两个文件
+        clips = []
+        offsets = []
+        offset = 0
+        for audio, speech in zip(arrays, speeches):
+            offsets.append(offset)
+            for clip in merge_segments(speech, vad_options):
+                clips.append({"start": clip["start"] + offset, "end": clip["end"] + offset})
+            offset += len(audio)
+
+        durations = [len(audio) / SAMPLE_RATE for audio in arrays]
+        starts = [o / SAMPLE_RATE for o in offsets]
+        per_file: List[list] = [[] for _ in arrays]
+        if clips:
+            segments_iter, _ = self.batched_model.transcribe(
+                np.concatenate(arrays),
+                language=language,
+                batch_size=self.config.batch_size,
+                beam_size=5,
+                clip_timestamps=clips
+            )
+            for seg in self._collect_segments(segments_iter, offset / SAMPLE_RATE):
+                idx = bisect.bisect_right(starts, seg.start) - 1
+                seg.start -= starts[idx]
+                seg.end = min(seg.end - starts[idx], durations[idx])
+                per_file[idx].append(seg)
+
+        return [
+            TranscriptionResult(
+                text=" ".join(seg.text for seg in segments),
+                segments=segments,
+                language=language,
+                duration=duration
+            )
+            for segments, duration in zip(per_file, durations)
+        ]
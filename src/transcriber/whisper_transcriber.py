@@ -1,15 +1,25 @@
-"""Whisper 语音识别模块 - 使用 OpenAI Whisper API"""
+"""Whisper 语音识别模块 - 支持 OpenAI Whisper API 和本地 faster-whisper"""
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pydantic import BaseModel
 import subprocess
-import math
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from ..config.settings import get_settings
 from ..utils.helpers import get_file_size, ensure_dir
-from ..utils.exceptions import ConfigurationError, TranscriptionError, AudioExtractionError
+from ..utils.exceptions import (
+    ConfigurationError, TranscriptionError, AudioExtractionError,
+    FileProcessingError, ValidationError
+)
+
+
+# 长音频分段时的静音检测参数
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_DURATION = 0.3
+SILENCE_SEARCH_WINDOW = 30.0
 
 
 class TranscriptionSegment(BaseModel):
@@ -34,31 +44,60 @@ class WhisperTranscriber:
         """初始化语音识别器"""
         self.settings = get_settings()
         self.logger = logging.getLogger(__name__)
+        self.backend = self.settings.whisper.backend
+        self.chunk_duration = self.settings.processing.chunk_duration
+        
+        # 本地推理后端，不需要 API key
+        if self.backend == "local":
+            from .faster_whisper_backend import FasterWhisperBackend
+            self.local_backend = FasterWhisperBackend(self.settings.whisper)
+            return
         
         # 初始化 OpenAI 客户端
         api_key = self.settings.openai.api_key
         if not api_key:
             raise ConfigurationError("OpenAI API key not configured", config_key="openai.api_key")
             
-        self.client = OpenAI(api_key=api_key)
-        self.chunk_duration = self.settings.processing.chunk_duration
+        # openai SDK 导入较慢，只在使用 API 后端时加载
+        from openai import OpenAI
+        from ..utils.http import get_shared_client
+        # 上传和转录大文件耗时较长，使用单独的 whisper.timeout，而不是翻译请求的超时
+        self.client = OpenAI(
+            api_key=api_key,
+            timeout=self.settings.whisper.timeout,
+            http_client=get_shared_client()
+        )
         
-    def transcribe(self, audio_path: Path) -> TranscriptionResult:
+    def transcribe(
+        self,
+        audio_path: Union[Path, Any],
+        file_size: Optional[int] = None
+    ) -> TranscriptionResult:
         """转录音频文件
         
         Args:
-            audio_path: 音频文件路径
+            audio_path: 音频文件路径；local 后端也可直接传入 16kHz float32 音频数组
+            file_size: 调用方已知的文件大小（字节），避免重复 stat
             
         Returns:
             转录结果
         """
-        if not audio_path.exists():
-            raise FileProcessingError(f"Audio file not found: {audio_path}", file_path=str(audio_path))
+        if self.backend == "local":
+            if isinstance(audio_path, Path) and not audio_path.exists():
+                raise FileProcessingError(f"Audio file not found: {audio_path}", file_path=str(audio_path))
+            return self.local_backend.transcribe(audio_path)
+        
+        if file_size is None:
+            # 一次 stat 同时完成存在性检查和大小获取
+            try:
+                file_size = get_file_size(audio_path)
+            except FileNotFoundError:
+                raise FileProcessingError(f"Audio file not found: {audio_path}", file_path=str(audio_path))
             
         self.logger.info(f"Starting transcription: {audio_path}")
         
         # 检查文件大小
-        file_size_mb = get_file_size(audio_path) / (1024 * 1024)
+        file_size_mb = file_size / (1024 * 1024)
         self.logger.info(f"Audio file size: {file_size_mb:.2f} MB")
         
         # OpenAI Whisper API 文件大小限制为 25MB
@@ -80,14 +119,11 @@ class WhisperTranscriber:
                     temperature=0.0
                 )
             
-            # 解析响应
-            segments = []
-            for seg in response.segments:
-                segments.append(TranscriptionSegment(
-                    text=seg.text.strip(),
-                    start=seg.start,
-                    end=seg.end
-                ))
+            # 解析响应（一次列表推导构建全部片段）
+            segments = [
+                TranscriptionSegment(text=seg.text.strip(), start=seg.start, end=seg.end)
+                for seg in response.segments
+            ]
             
             result = TranscriptionResult(
                 text=response.text,
@@ -107,7 +143,27 @@ class WhisperTranscriber:
             self.logger.error(f"Transcription failed: {str(e)}")
             raise TranscriptionError(f"Transcription failed: {str(e)}", audio_path=str(audio_path)) from e
     
-    def transcribe_with_chunks(self, audio_path: Path, chunk_duration: int = 300) -> TranscriptionResult:
+    def transcribe_batch(self, audios: List[Union[Path, Any]]) -> List[TranscriptionResult]:
+        """批量转录多个音频
+        
+        local 后端跨文件拼批解码；API 后端每个文件仍是一次独立请求，逐个转录。
+        
+        Args:
+            audios: 音频文件路径或 16kHz float32 音频数组列表
+            
+        Returns:
+            与输入顺序一致的转录结果列表
+        """
+        if self.backend == "local":
+            return self.local_backend.transcribe_batch(audios)
+        return [self.transcribe(audio) for audio in audios]
+    
+    def transcribe_with_chunks(
+        self,
+        audio_path: Path,
+        chunk_duration: int = 300,
+        file_size: Optional[int] = None
+    ) -> TranscriptionResult:
         """分段转录长音频文件
         
         当音频文件超过 25MB 时，自动分段处理。
@@ -115,60 +171,83 @@ class WhisperTranscriber:
         Args:
             audio_path: 音频文件路径
             chunk_duration: 每个分段的时长（秒），默认5分钟
+            file_size: 调用方已知的文件大小（字节），避免重复 stat
             
         Returns:
             合并后的转录结果
         """
+        # 本地推理没有上传大小限制，直接转录
+        if self.backend == "local":
+            return self.transcribe(audio_path)
+        
         # 检查文件大小
-        file_size_mb = get_file_size(audio_path) / (1024 * 1024)
+        if file_size is None:
+            file_size = get_file_size(audio_path)
+        file_size_mb = file_size / (1024 * 1024)
         
         # 如果文件小于 20MB（留一些余量），直接转录
         if file_size_mb < 20:
-            return self.transcribe(audio_path)
+            return self.transcribe(audio_path, file_size=file_size)
         
         # 获取音频时长
         audio_duration = self._get_audio_duration(audio_path)
         
-        # 计算分段数量
-        num_chunks = math.ceil(audio_duration / chunk_duration)
+        # 分段边界尽量落在静音处，避免切断单词
+        chunk_plan_times = self._plan_chunks(audio_path, audio_duration, chunk_duration)
+        num_chunks = len(chunk_plan_times)
         self.logger.info(f"音频时长 {audio_duration:.1f}秒，将分为 {num_chunks} 个分段处理")
         
-        # 分段处理
-        all_segments = []
-        temp_dir = audio_path.parent / "temp_chunks"
+        # 分段处理：后台线程依次切分，切好的分段并发提交转录
+        temp_dir = audio_path.parent / f"{audio_path.stem}_chunks"
         temp_dir.mkdir(exist_ok=True)
         
+        chunk_plan = [
+            (temp_dir / f"chunk_{i:03d}.wav", start_time, duration)
+            for i, (start_time, duration) in enumerate(chunk_plan_times)
+        ]
+        
+        chunk_queue: queue.Queue = queue.Queue(maxsize=2)
+        stop_event = threading.Event()
+        producer = threading.Thread(
+            target=self._produce_chunks,
+            args=(audio_path, chunk_plan, chunk_queue, stop_event),
+            daemon=True
+        )
+        producer.start()
+        
         try:
-            for i in range(num_chunks):
-                start_time = i * chunk_duration
-                duration = min(chunk_duration, audio_duration - start_time)
-                
-                # 切分音频
-                chunk_path = temp_dir / f"chunk_{i:03d}.wav"
-                self._split_audio(audio_path, chunk_path, start_time, duration)
-                
-                # 转录分段
-                self.logger.info(f"转录分段 {i+1}/{num_chunks}...")
-                chunk_result = self.transcribe(chunk_path)
-                
-                # 调整时间戳
-                for segment in chunk_result.segments:
-                    adjusted_segment = TranscriptionSegment(
-                        text=segment.text,
-                        start=segment.start + start_time,
-                        end=segment.end + start_time
-                    )
-                    all_segments.append(adjusted_segment)
+            workers = max(1, min(self.settings.openai.max_concurrent_requests, num_chunks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = []
+                for i in range(num_chunks):
+                    item = chunk_queue.get()
+                    if isinstance(item, Exception):
+                        raise item
+                    chunk_path, start_time = item
+                    self.logger.info(f"转录分段 {i+1}/{num_chunks}...")
+                    futures.append((executor.submit(self.transcribe, chunk_path), chunk_path, start_time))
                 
-                # 删除临时文件
-                chunk_path.unlink()
+                all_segments = []
+                language = 'auto'
+                for future, chunk_path, start_time in futures:
+                    chunk_result = future.result()
+                    language = chunk_result.language
+                    
+                    # 原地调整时间戳，分段结果只在这里使用，无需复制出新对象
+                    for segment in chunk_result.segments:
+                        segment.start += start_time
+                        segment.end += start_time
+                    all_segments.extend(chunk_result.segments)
+                    
+                    # 删除临时文件
+                    chunk_path.unlink()
             
             # 合并结果
             full_text = " ".join(seg.text for seg in all_segments)
             result = TranscriptionResult(
                 text=full_text,
                 segments=all_segments,
-                language=chunk_result.language if 'chunk_result' in locals() else 'auto',
+                language=language,
                 duration=audio_duration
             )
             
@@ -176,12 +255,109 @@ class WhisperTranscriber:
             return result
             
         finally:
-            # 清理临时目录
-            if temp_dir.exists():
+            # 停止切分线程并清理临时目录
+            stop_event.set()
+            while producer.is_alive():
                 try:
-                    temp_dir.rmdir()
-                except:
-                    pass  # 忽略删除失败
+                    chunk_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            for chunk_path in temp_dir.glob("chunk_*.wav"):
+                chunk_path.unlink()
+            try:
+                temp_dir.rmdir()
+            except OSError:
+                pass  # 忽略删除失败
+    
+    def _plan_chunks(
+        self,
+        audio_path: Path,
+        audio_duration: float,
+        chunk_duration: float
+    ) -> List[Tuple[float, float]]:
+        """规划分段，边界优先放在静音中点
+        
+        每个分段最长 chunk_duration 秒；在分段末尾 SILENCE_SEARCH_WINDOW 秒内
+        找最靠后的静音作为边界，找不到时按固定时长切分。
+        
+        Args:
+            audio_path: 音频文件路径
+            audio_duration: 音频时长（秒）
+            chunk_duration: 分段最大时长（秒）
+            
+        Returns:
+            (开始时间, 时长) 列表
+        """
+        silences = self._detect_silences(audio_path)
+        window = min(SILENCE_SEARCH_WINDOW, chunk_duration / 2)
+        
+        plan = []
+        start = 0.0
+        while audio_duration - start > chunk_duration:
+            limit = start + chunk_duration
+            end = limit
+            for mid in reversed(silences):
+                if mid <= limit:
+                    if mid > limit - window:
+                        end = mid
+                    break
+            plan.append((start, end - start))
+            start = end
+        plan.append((start, audio_duration - start))
+        return plan
+    
+    def _detect_silences(self, audio_path: Path) -> List[float]:
+        """用 FFmpeg silencedetect 找出静音区间，返回各区间中点（秒）
+        
+        检测失败时返回空列表，由调用方退回固定时长切分。
+        """
+        cmd = [
+            'ffmpeg', '-hide_banner', '-nostats',
+            '-i', str(audio_path),
+            '-af', f'silencedetect=noise={SILENCE_NOISE_DB}dB:d={SILENCE_MIN_DURATION}',
+            '-f', 'null', '-'
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except Exception as e:
+            self.logger.warning(f"静音检测失败，按固定时长分段: {e}")
+            return []
+        
+        midpoints = []
+        silence_start = None
+        for line in result.stderr.splitlines():
+            if 'silence_start:' in line:
+                silence_start = float(line.rsplit('silence_start:', 1)[1].split()[0])
+            elif 'silence_end:' in line and silence_start is not None:
+                silence_end = float(line.rsplit('silence_end:', 1)[1].split()[0])
+                midpoints.append((silence_start + silence_end) / 2)
+                silence_start = None
+        return midpoints
+    
+    def _produce_chunks(
+        self,
+        audio_path: Path,
+        chunk_plan: List[Tuple[Path, float, float]],
+        chunk_queue: queue.Queue,
+        stop_event: threading.Event
+    ) -> None:
+        """按计划依次切分音频并放入队列（在后台线程运行）
+        
+        Args:
+            audio_path: 音频文件路径
+            chunk_plan: (分段路径, 开始时间, 时长) 列表
+            chunk_queue: 输出队列，元素为 (分段路径, 开始时间) 或异常
+            stop_event: 停止信号
+        """
+        for chunk_path, start_time, duration in chunk_plan:
+            if stop_event.is_set():
+                return
+            try:
+                self._split_audio(audio_path, chunk_path, start_time, duration)
+            except Exception as e:
+                chunk_queue.put(e)
+                return
+            chunk_queue.put((chunk_path, start_time))
     
     def _get_audio_duration(self, audio_path: Path) -> float:
         """获取音频文件时长
@@ -214,10 +390,13 @@ class WhisperTranscriber:
             duration: 持续时间（秒）
         """
         try:
+            # -ss 放在 -i 之前按输入定位，直接跳到起点读取，
+            # 不再从文件开头解码再丢弃前面的数据（WAV 定位是采样精确的）
             cmd = [
-                'ffmpeg', '-y', '-i', str(input_path),
+                'ffmpeg', '-y', '-loglevel', 'error',
                 '-ss', str(start),
                 '-t', str(duration),
+                '-i', str(input_path),
                 '-acodec', 'pcm_s16le',
                 '-ar', '16000',
                 '-ac', '1',
@@ -251,7 +430,7 @@ class WhisperTranscriber:
         Returns:
             格式化的时间戳 (HH:MM:SS)
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
+        # 一次取整后用整数 divmod 拆分，不再对浮点数重复取模
+        minutes, secs = divmod(max(0, int(seconds)), 60)
+        hours, minutes = divmod(minutes, 60)
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
\ No newline at end of file
@@ -1,16 +1,179 @@
 """OpenAI 翻译模块"""
 import logging
 import json
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
 
 from ..config.settings import get_settings
 from ..transcriber.whisper_transcriber import TranscriptionSegment
 from ..utils.exceptions import ConfigurationError, TranslationError, APIError
-from .paragraph_detector import ParagraphDetector, Paragraph
+from ..utils.translation_cache import MemoryTranslationCache, TranslationCache
+from ..utils.rate_limiter import RateLimiter
+from .paragraph_detector import CONTINUATIONS, ParagraphDetector, Paragraph
 from .timestamp_redistributor import TimestampRedistributor
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# orjson 为可选依赖，用于批量请求和响应的 JSON 编解码
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# 响应被包在 markdown 代码块中时提取 JSON 内容
+JSON_CODE_BLOCK_RE = re.compile(r'```json\s*\n?(.+?)\n?```', re.DOTALL)
+
+# 提示词中使用的语言名称
+LANGUAGE_NAMES = {
+    "zh-cn": "Simplified Chinese",
+    "zh-tw": "Traditional Chinese",
+    "en": "English",
+    "ja": "Japanese",
+    "ko": "Korean",
+    "es": "Spanish",
+    "fr": "French",
+    "de": "German",
+    "ru": "Russian",
+    "ar": "Arabic"
+}
+
+# 每批原文的估算 token 上限：译文长度与原文相当，给 max_tokens=4000 的输出留足余量，
+# 长句较多的批次提前拆分，避免响应被截断后逐条重试
+BATCH_TOKEN_BUDGET = 1500
+# 每个片段在请求 JSON 中的结构开销（序号、时长、键名和引号）
+SEGMENT_TOKEN_OVERHEAD = 12
+
+# Batch API 任务的轮询间隔（秒）：从 BATCH_POLL_INTERVAL 开始翻倍，最长 BATCH_POLL_MAX_INTERVAL
+BATCH_POLL_INTERVAL = 15
+BATCH_POLL_MAX_INTERVAL = 300
+# Batch API 任务的终止状态
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算文本的 token 数
+
+    按 UTF-8 字节数的 1/3 估算：中日韩文字约 1 字 1 token，英文偏高估，用于控制批次大小足够。
+    """
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+# OpenAI 客户端按配置复用，底层共享同一个 HTTP 连接池
+_CLIENT_CACHE: Dict[tuple, "OpenAI"] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _get_client(api_key: str, max_retries: int, timeout: float) -> "OpenAI":
+    """获取（或创建）共享的 OpenAI 客户端"""
+    # openai SDK 导入较慢，创建客户端时才加载
+    from openai import OpenAI
+    from ..utils.http import get_shared_client
+
+    key = (api_key, max_retries, timeout)
+    with _CLIENT_CACHE_LOCK:
+        if key not in _CLIENT_CACHE:
+            # SDK 内置对 429/5xx 的指数退避重试
+            _CLIENT_CACHE[key] = OpenAI(
+                api_key=api_key,
+                max_retries=max_retries,
+                timeout=timeout,
+                http_client=get_shared_client()
+            )
+        return _CLIENT_CACHE[key]
+
+
+# 翻译缓存按 (文件, 模型) 复用同一个 SQLite 连接，不再每个视频各开一个；
+# 未启用持久化时文件为 None，使用进程内的内存缓存
+_TRANSLATION_CACHES: Dict[tuple, Any] = {}
+
+
+def _get_translation_cache(cache_file: Optional[str], model: str):
+    """获取（或创建）共享的翻译缓存"""
+    key = (str(Path(cache_file).resolve()) if cache_file else None, model)
+    with _CLIENT_CACHE_LOCK:
+        if key not in _TRANSLATION_CACHES:
+            if cache_file:
+                _TRANSLATION_CACHES[key] = TranslationCache(Path(cache_file), model)
+            else:
+                _TRANSLATION_CACHES[key] = MemoryTranslationCache(model)
+        return _TRANSLATION_CACHES[key]
+
+
+# 速率限制与并发上限在进程内共享：多个视频同时翻译时，总请求量仍受同一组配置约束
+_RATE_LIMITERS: Dict[float, RateLimiter] = {}
+_TOKEN_LIMITERS: Dict[float, RateLimiter] = {}
+_REQUEST_SLOTS: Dict[int, threading.BoundedSemaphore] = {}
+
+
+def _get_rate_limiter(requests_per_minute: float) -> RateLimiter:
+    """获取（或创建）进程共享的限流器"""
+    with _CLIENT_CACHE_LOCK:
+        if requests_per_minute not in _RATE_LIMITERS:
+            _RATE_LIMITERS[requests_per_minute] = RateLimiter(requests_per_minute, 60)
+        return _RATE_LIMITERS[requests_per_minute]
+
+
+def _get_token_limiter(tokens_per_minute: float) -> RateLimiter:
+    """获取（或创建）进程共享的 token 限流器"""
+    with _CLIENT_CACHE_LOCK:
+        if tokens_per_minute not in _TOKEN_LIMITERS:
+            _TOKEN_LIMITERS[tokens_per_minute] = RateLimiter(tokens_per_minute, 60)
+        return _TOKEN_LIMITERS[tokens_per_minute]
+
+
+def _get_request_slots(max_concurrent_requests: int) -> threading.BoundedSemaphore:
+    """获取（或创建）进程共享的并发请求信号量"""
+    with _CLIENT_CACHE_LOCK:
+        if max_concurrent_requests not in _REQUEST_SLOTS:
+            _REQUEST_SLOTS[max_concurrent_requests] = threading.BoundedSemaphore(
+                max(1, max_concurrent_requests)
+            )
+        return _REQUEST_SLOTS[max_concurrent_requests]
+
+
+# 句子未结束的标点（元组可直接传给 str.endswith）
+INCOMPLETE_ENDINGS = (',', ';', ':', '—', '–')
+
+
+# Whisper API 返回英文语言名，faster-whisper 返回语言代码
+WHISPER_LANGUAGE_CODES = {
+    "english": "en",
+    "japanese": "ja",
+    "korean": "ko",
+    "spanish": "es",
+    "french": "fr",
+    "german": "de",
+    "russian": "ru",
+    "arabic": "ar",
+    "chinese": "zh",
+}
+
+
+def is_same_language(source_language: str, target_language: str) -> bool:
+    """判断识别出的源语言是否已经是目标语言
+    
+    带地区后缀的目标语言（如 zh-cn/zh-tw）可能需要简繁转换，始终视为需要翻译。
+    
+    Args:
+        source_language: Whisper 识别出的语言
+        target_language: 目标语言代码
+        
+    Returns:
+        是否无需翻译
+    """
+    target = target_language.lower()
+    if "-" in target or not source_language:
+        return False
+    source = source_language.lower()
+    return WHISPER_LANGUAGE_CODES.get(source, source) == target
+
 
 class TranslationSegment(BaseModel):
     """翻译片段"""
@@ -27,6 +190,36 @@ class TranslationResult(BaseModel):
     target_language: str
     input_tokens: Optional[int] = None
     output_tokens: Optional[int] = None
+    # 其中通过 Batch API 完成的部分，按 Batch 价格计费
+    batch_input_tokens: int = 0
+    batch_output_tokens: int = 0
+
+
+def passthrough_translation(
+    segments: List[TranscriptionSegment],
+    source_language: str,
+    target_language: str
+) -> TranslationResult:
+    """源语言与目标语言相同时，直接把原文作为译文，不调用 API
+    
+    Args:
+        segments: 转录片段列表
+        source_language: 源语言
+        target_language: 目标语言
+        
+    Returns:
+        翻译结果
+    """
+    return TranslationResult(
+        segments=[
+            TranslationSegment(original=seg.text, translated=seg.text, start=seg.start, end=seg.end)
+            for seg in segments
+        ],
+        source_language=source_language,
+        target_language=target_language,
+        input_tokens=0,
+        output_tokens=0
+    )
 
 
 class OpenAITranslator:
@@ -42,14 +235,37 @@ class OpenAITranslator:
         if not api_key:
             raise ConfigurationError("OpenAI API key not configured", config_key="openai.api_key")
             
-        self.client = OpenAI(api_key=api_key)
+        self.client = _get_client(
+            api_key,
+            self.settings.openai.max_retries,
+            self.settings.openai.timeout
+        )
         self.model = self.settings.openai.model
         self.batch_size = self.settings.translation.batch_size
         self.target_language = self.settings.translation.target_language
+        self.target_lang_name = self._get_language_name(self.target_language)
+        # 批量翻译的系统提示只随源语言变化，按源语言缓存，避免每个批次重新格式化
+        self._system_prompts: Dict[str, str] = {}
         
-        # Token使用统计
+        # Token使用统计（batch_* 为其中通过 Batch API 完成的部分）
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.batch_input_tokens = 0
+        self.batch_output_tokens = 0
+        self._usage_lock = threading.Lock()
+        
+        # 并发请求与速率限制
+        self.max_concurrent_requests = self.settings.openai.max_concurrent_requests
+        self.rate_limiter = _get_rate_limiter(self.settings.openai.requests_per_minute)
+        tokens_per_minute = self.settings.openai.tokens_per_minute
+        self.token_limiter = _get_token_limiter(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.request_slots = _get_request_slots(self.max_concurrent_requests)
+        
+        # 翻译缓存（未启用持久化缓存时仍在进程内去重）
+        cache_file = None
+        if self.settings.translation.cache_enabled:
+            cache_file = self.settings.translation.cache_file
+        self.cache = _get_translation_cache(cache_file, self.model)
         
         # 段落模式组件
         self.paragraph_mode = self.settings.translation.paragraph_mode
@@ -92,6 +308,80 @@ class OpenAITranslator:
             )
             return self._translate_traditional_mode(segments, source_language)
     
+    def translate_many(
+        self,
+        documents: List[Tuple[List[TranscriptionSegment], str]]
+    ) -> List[TranslationResult]:
+        """合并翻译多个文件
+        
+        传统模式下把多个文件的片段按源语言拼成批次，短视频共用同一个请求，
+        省去每个文件单独发送系统提示的开销。请求的 token 用量按各文件原文字符数分摊。
+        段落模式的提示词针对单个段落的时长，仍逐个文件翻译。
+        
+        Args:
+            documents: (转录片段列表, 源语言) 列表
+            
+        Returns:
+            与输入顺序一致的翻译结果列表
+        """
+        if self.paragraph_mode or len(documents) < 2:
+            return [self.translate(segments, language) for segments, language in documents]
+        
+        merged_docs = [self._merge_incomplete_segments(segments) for segments, _ in documents]
+        self.logger.info(
+            f"Starting coalesced translation: {len(documents)} files, "
+            f"{sum(len(m) for m in merged_docs)} segments"
+        )
+        
+        self.total_input_tokens = 0
+        self.total_output_tokens = 0
+        self.batch_input_tokens = 0
+        self.batch_output_tokens = 0
+        
+        # 同一源语言的不同原文连续排列后切分批次，批次可以跨越文件边界；
+        # 多个文件中重复的句子只翻译一次，命中缓存的句子不进入批次
+        by_language: Dict[str, Dict[str, TranscriptionSegment]] = {}
+        for (_, language), merged in zip(documents, merged_docs):
+            unique = by_language.setdefault(language, {})
+            for seg in merged:
+                unique.setdefault(seg.text, seg)
+        translations: Dict[str, Dict[str, str]] = {}
+        batches = []
+        for language, unique in by_language.items():
+            translations[language], pending = self._lookup_cache(list(unique.values()), language)
+            batches.extend((language, batch) for batch in self._pack_batches(pending))
+        batch_results = self._run_batches(batches)
+        
+        for (language, _), translated in zip(batches, batch_results):
+            translations[language].update(
+                (seg.original, seg.translated) for seg in translated
+            )
+        per_doc = [
+            self._apply_translations(merged, translations.get(language, {}))
+            for merged, (_, language) in zip(merged_docs, documents)
+        ]
+        
+        chars = [sum(len(seg.text) for seg in merged) for merged in merged_docs]
+        total_chars = sum(chars) or 1
+        results = [
+            TranslationResult(
+                segments=translated,
+                source_language=language,
+                target_language=self.target_language,
+                input_tokens=round(self.total_input_tokens * n / total_chars),
+                output_tokens=round(self.total_output_tokens * n / total_chars),
+                batch_input_tokens=round(self.batch_input_tokens * n / total_chars),
+                batch_output_tokens=round(self.batch_output_tokens * n / total_chars)
+            )
+            for translated, (_, language), n in zip(per_doc, documents, chars)
+        ]
+        
+        self.logger.info(
+            f"Coalesced translation completed: {len(batches)} batches, "
+            f"tokens used: {self.total_input_tokens} input, {self.total_output_tokens} output"
+        )
+        return results
+    
     def _translate_traditional_mode(
         self,
         segments: List[TranscriptionSegment],
@@ -107,20 +397,31 @@ class OpenAITranslator:
         # 重置token统计
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.batch_input_tokens = 0
+        self.batch_output_tokens = 0
         
-        # 按批次处理
-        translated_segments = []
-        for i in range(0, len(merged_segments), self.batch_size):
-            batch = merged_segments[i:i + self.batch_size]
-            batch_result = self._translate_batch(batch, source_language)
-            translated_segments.extend(batch_result)
+        # 重复的句子只翻译一次；先整体查询缓存，只把未命中的句子装批并发请求
+        unique: Dict[str, TranscriptionSegment] = {}
+        for seg in merged_segments:
+            unique.setdefault(seg.text, seg)
+        if len(unique) < len(merged_segments):
+            self.logger.info(f"Deduplicated segments: {len(merged_segments)} -> {len(unique)} unique texts")
+        translations, pending = self._lookup_cache(list(unique.values()), source_language)
+        batch_results = self._run_batches(
+            [(source_language, batch) for batch in self._pack_batches(pending)]
+        )
+        for batch_result in batch_results:
+            translations.update((seg.original, seg.translated) for seg in batch_result)
+        translated_segments = self._apply_translations(merged_segments, translations)
         
         result = TranslationResult(
             segments=translated_segments,
             source_language=source_language,
             target_language=self.target_language,
             input_tokens=self.total_input_tokens,
-            output_tokens=self.total_output_tokens
+            output_tokens=self.total_output_tokens,
+            batch_input_tokens=self.batch_input_tokens,
+            batch_output_tokens=self.batch_output_tokens
         )
         
         self.logger.info(
@@ -129,12 +430,87 @@ class OpenAITranslator:
         )
         return result
     
-    def _translate_batch(
+    def _pack_batches(self, segments: List[TranscriptionSegment]) -> List[List[TranscriptionSegment]]:
+        """按顺序把片段装入批次
+        
+        每批最多 batch_size 个片段，且估算的 token 数不超过 BATCH_TOKEN_BUDGET；
+        单个超长片段独占一批。
+        
+        Args:
+            segments: 转录片段列表
+            
+        Returns:
+            批次列表
+        """
+        batches = []
+        current: List[TranscriptionSegment] = []
+        tokens = 0
+        for seg in segments:
+            cost = estimate_tokens(seg.text) + SEGMENT_TOKEN_OVERHEAD
+            if current and (len(current) >= self.batch_size or tokens + cost > BATCH_TOKEN_BUDGET):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append(seg)
+            tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+    
+    @staticmethod
+    def _apply_translations(
+        segments: List[TranscriptionSegment],
+        translations: Dict[str, str]
+    ) -> List[TranslationSegment]:
+        """按原文把译文填回每个片段（去重翻译后展开）
+        
+        Args:
+            segments: 转录片段列表
+            translations: {原文: 译文} 字典
+            
+        Returns:
+            与输入顺序一致的翻译片段列表
+        """
+        return [
+            TranslationSegment(
+                original=seg.text,
+                translated=translations[seg.text],
+                start=seg.start,
+                end=seg.end
+            )
+            for seg in segments
+        ]
+    
+    def _lookup_cache(
+        self,
+        segments: List[TranscriptionSegment],
+        source_language: str
+    ) -> Tuple[Dict[str, str], List[TranscriptionSegment]]:
+        """在切分批次之前批量查询缓存
+        
+        Args:
+            segments: 原文互不相同的转录片段
+            source_language: 源语言
+            
+        Returns:
+            (命中缓存的 {原文: 译文} 字典, 需要请求 API 的片段列表)
+        """
+        cached: Dict[str, str] = {}
+        if self.cache:
+            cached = self.cache.get_many(
+                [seg.text for seg in segments], source_language, self.target_language
+            )
+        if not cached:
+            return cached, segments
+        
+        self.logger.info(f"Translation cache hits: {len(cached)}/{len(segments)}")
+        return cached, [seg for seg in segments if seg.text not in cached]
+    
+    def _request_batch(
         self,
         segments: List[TranscriptionSegment],
         source_language: str
     ) -> List[TranslationSegment]:
-        """批量翻译片段
+        """调用 API 批量翻译片段
         
         Args:
             segments: 转录片段批次
@@ -150,74 +526,337 @@ class OpenAITranslator:
         self.logger.info(f"Translating batch of {len(texts)} texts")
         self.logger.debug(f"Texts to translate: {texts}")
         
-        # 构建系统提示
-        system_prompt = self._build_system_prompt(source_language)
-        
-        # 构建用户消息（现在包含时长信息）
-        user_message = self._build_batch_message(segments)
-        
         try:
-            # 调用 OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                temperature=0.3,
-                max_tokens=4000
-            )
-            
-            # 记录token使用量
-            if hasattr(response, 'usage') and response.usage:
-                self.total_input_tokens += response.usage.prompt_tokens
-                self.total_output_tokens += response.usage.completion_tokens
-                self.logger.debug(
-                    f"Batch token usage: {response.usage.prompt_tokens} input, "
-                    f"{response.usage.completion_tokens} output"
-                )
-            
-            # 解析响应
+            response = self._create_completion(**self._batch_request_body(segments, source_language))
             content = response.choices[0].message.content
+        except Exception as e:
+            self.logger.error(f"Translation batch failed: {str(e)}")
+            raise TranslationError(
+                f"Translation failed: {str(e)}", 
+                source_lang=source_language,
+                target_lang=self.target_language
+            ) from e
+        
+        # 提升日志级别以便调试
+        self.logger.info(f"API response received, length: {len(content)} chars")
+        return self._collect_translations(segments, content, source_language)
+    
+    def _batch_request_body(
+        self,
+        segments: List[TranscriptionSegment],
+        source_language: str
+    ) -> Dict[str, Any]:
+        """构建批量翻译的 Chat Completions 请求参数（同步请求与 Batch API 共用）"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self._build_system_prompt(source_language)},
+                # 用户消息包含每个片段的时长信息
+                {"role": "user", "content": self._build_batch_message(segments)}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 4000,
+            # JSON 模式保证返回可解析的对象
+            "response_format": {"type": "json_object"}
+        }
+    
+    def _collect_translations(
+        self,
+        segments: List[TranscriptionSegment],
+        content: str,
+        source_language: str
+    ) -> List[TranslationSegment]:
+        """解析批量响应，写入缓存，并逐条重试缺失的片段
+        
+        Args:
+            segments: 转录片段批次
+            content: API 响应内容
+            source_language: 源语言
             
-            # 提升日志级别以便调试
-            self.logger.info(f"API response received, length: {len(content)} chars")
-            
+        Returns:
+            与输入顺序一致的翻译片段列表
+        """
+        try:
             translations = self._parse_translations(content)
-            self.logger.info(f"Parsed {len(translations)} translations")
-            
-            # 检查翻译数量是否匹配
-            if len(translations) != len(segments):
-                self.logger.warning(
-                    f"Translation count mismatch: "
-                    f"expected {len(segments)}, got {len(translations)}. "
-                    f"Using intelligent alignment."
-                )
-                self.logger.debug(f"Original texts: {texts}")
-                self.logger.debug(f"Translations received: {translations}")
-                
-                # 使用智能对齐
-                return self._align_translations(segments, translations)
-            
-            # 数量匹配时的正常处理
-            result = []
-            for seg, trans in zip(segments, translations):
+        except APIError as e:
+            self.logger.warning(f"Failed to parse batch response: {e}")
+            translations = {}
+        self.logger.info(f"Parsed {len(translations)} translations")
+        
+        # 按序号对应译文，结果与输入顺序一一对应
+        result: List[Optional[TranslationSegment]] = []
+        missing = []
+        for i, seg in enumerate(segments):
+            if i in translations:
                 result.append(TranslationSegment(
                     original=seg.text,
-                    translated=trans,
+                    translated=translations[i],
                     start=seg.start,
                     end=seg.end
                 ))
-                
-            return result
+            else:
+                result.append(None)
+                missing.append(i)
+        
+        # 写入缓存
+        if self.cache and len(missing) < len(segments):
+            self.cache.set_many(
+                [(seg.original, seg.translated) for seg in result if seg is not None],
+                source_language, self.target_language
+            )
+        
+        if missing:
+            retried = self._translate_missing(
+                [segments[i] for i in missing], source_language, len(segments)
+            )
+            for i, seg in zip(missing, retried):
+                result[i] = seg
+        return result
+    
+    def _translate_missing(
+        self,
+        segments: List[TranscriptionSegment],
+        source_language: str,
+        batch_size: int
+    ) -> List[TranslationSegment]:
+        """逐条重新翻译批量响应中缺失的片段
+        
+        Args:
+            segments: 缺失译文的片段
+            source_language: 源语言
+            batch_size: 原批次大小，为 1 时不再重试
             
+        Returns:
+            翻译片段列表
+        """
+        if batch_size > 1:
+            self.logger.warning(
+                f"Translation missing for {len(segments)}/{batch_size} segments, "
+                f"retrying individually"
+            )
+            # 各条重试相互独立，与批次一样并发请求
+            retried = self._map_concurrent(
+                lambda seg: self._request_batch([seg], source_language), segments
+            )
+            return [trans for result in retried for trans in result]
+        
+        # 单条仍然失败，保留原文
+        self.logger.warning(f"Translation failed, keeping original text: {segments[0].text[:50]}")
+        return [
+            TranslationSegment(original=seg.text, translated=seg.text, start=seg.start, end=seg.end)
+            for seg in segments
+        ]
+    
+    def _run_batches(
+        self,
+        batches: List[Tuple[str, List[TranscriptionSegment]]]
+    ) -> List[List[TranslationSegment]]:
+        """翻译所有批次，待翻译片段足够多时整体提交 Batch API
+        
+        Args:
+            batches: (源语言, 转录片段批次) 列表
+            
+        Returns:
+            与批次顺序一致的翻译结果列表
+        """
+        threshold = self.settings.translation.batch_api_threshold
+        if threshold > 0 and sum(len(batch) for _, batch in batches) >= threshold:
+            try:
+                job_id = self._submit_batch_job(batches)
+            except Exception as e:
+                # 任务尚未提交，直接请求不会重复计费
+                self.logger.warning(f"Batch API submission failed, falling back to direct requests: {e}")
+            else:
+                return self._run_batch_job(job_id, batches)
+        return self._map_concurrent(lambda batch: self._request_batch(batch[1], batch[0]), batches)
+    
+    def _submit_batch_job(self, batches: List[Tuple[str, List[TranscriptionSegment]]]) -> str:
+        """把所有批次写成 JSONL 上传并创建 Batch API 任务
+        
+        每个批次对应 JSONL 中的一个请求，custom_id 为批次序号。
+        
+        Args:
+            batches: (源语言, 转录片段批次) 列表
+            
+        Returns:
+            任务 ID
+        """
+        dumps = orjson.dumps if orjson is not None else (
+            lambda obj: json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        )
+        payload = b"\n".join(
+            dumps({
+                "custom_id": str(n),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._batch_request_body(segments, language)
+            })
+            for n, (language, segments) in enumerate(batches)
+        )
+        
+        input_file = self.client.files.create(file=("translations.jsonl", payload), purpose="batch")
+        job = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        self.logger.info(f"Submitted Batch API job {job.id} with {len(batches)} requests")
+        return job.id
+    
+    def _run_batch_job(
+        self,
+        job_id: str,
+        batches: List[Tuple[str, List[TranscriptionSegment]]]
+    ) -> List[List[TranslationSegment]]:
+        """等待已提交的 Batch API 任务并收集结果
+        
+        任务结束后未成功返回的批次改为直接请求。轮询或下载出错时任务仍在运行，
+        先取消任务再直接请求，避免同一批内容付两次费；无法取消时抛出异常。
+        
+        Args:
+            job_id: 任务 ID
+            batches: (源语言, 转录片段批次) 列表
+            
+        Returns:
+            与批次顺序一致的翻译结果列表
+        """
+        contents: Dict[str, str] = {}
+        try:
+            job = self._wait_for_batch_job(job_id)
+            status = job.status
+            if job.output_file_id:
+                for custom_id, body in self._iter_batch_results(job.output_file_id):
+                    usage = body.get("usage")
+                    if usage:
+                        with self._usage_lock:
+                            self.total_input_tokens += usage["prompt_tokens"]
+                            self.total_output_tokens += usage["completion_tokens"]
+                            self.batch_input_tokens += usage["prompt_tokens"]
+                            self.batch_output_tokens += usage["completion_tokens"]
+                    contents[custom_id] = body["choices"][0]["message"]["content"]
         except Exception as e:
-            self.logger.error(f"Translation batch failed: {str(e)}")
-            raise TranslationError(
-                f"Translation failed: {str(e)}", 
-                source_lang=source_language,
-                target_lang=self.target_language
-            ) from e
+            if not self._cancel_batch_job(job_id):
+                raise TranslationError(
+                    f"Batch API job {job_id} failed and could not be cancelled: {e}",
+                    target_lang=self.target_language
+                ) from e
+            self.logger.warning(f"Batch API job {job_id} failed and was cancelled: {e}")
+            status = "cancelled"
+            contents = {}
+        except BaseException:
+            # 中断（Ctrl+C）时同样取消任务，不让它在后台继续计费
+            self._cancel_batch_job(job_id)
+            raise
+        
+        failed = [n for n in range(len(batches)) if str(n) not in contents]
+        if failed:
+            self.logger.warning(
+                f"Batch API job {job_id} ({status}) returned no result for "
+                f"{len(failed)}/{len(batches)} requests, retrying directly"
+            )
+        retried = dict(zip(failed, self._map_concurrent(
+            lambda n: self._request_batch(batches[n][1], batches[n][0]), failed
+        )))
+        return [
+            retried[n] if n in retried
+            else self._collect_translations(segments, contents[str(n)], language)
+            for n, (language, segments) in enumerate(batches)
+        ]
+    
+    def _cancel_batch_job(self, job_id: str) -> bool:
+        """取消 Batch API 任务
+        
+        Returns:
+            是否成功取消
+        """
+        try:
+            job = self.client.batches.cancel(job_id)
+        except Exception as e:
+            self.logger.error(f"Failed to cancel Batch API job {job_id}: {e}")
+            return False
+        self.logger.info(f"Cancelled Batch API job {job_id} ({job.status})")
+        return True
+    
+    def _iter_batch_results(self, file_id: str):
+        """逐行流式读取 Batch API 结果文件，只产出成功的请求
+        
+        结果文件可能有几十 MB，按行下载解析，不把整个文件读入内存再切分。
+        
+        Args:
+            file_id: 结果文件 ID
+            
+        Yields:
+            (custom_id, 响应体) 元组
+        """
+        loads = orjson.loads if orjson is not None else json.loads
+        with self.client.files.with_streaming_response.content(file_id) as output:
+            for line in output.iter_lines():
+                if not line.strip():
+                    continue
+                item = loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") == 200:
+                    yield item["custom_id"], response["body"]
+    
+    def _wait_for_batch_job(self, batch_id: str):
+        """轮询 Batch API 任务直到结束，轮询间隔逐步拉长
+        
+        Args:
+            batch_id: 任务 ID
+            
+        Returns:
+            结束状态的任务对象
+        """
+        interval = BATCH_POLL_INTERVAL
+        while True:
+            job = self.client.batches.retrieve(batch_id)
+            if job.status in BATCH_FINAL_STATUSES:
+                self.logger.info(f"Batch API job {batch_id} finished: {job.status}")
+                return job
+            counts = job.request_counts
+            self.logger.info(
+                f"Batch API job {batch_id} {job.status}"
+                + (f": {counts.completed}/{counts.total} requests done" if counts else "")
+            )
+            time.sleep(interval)
+            interval = min(interval * 2, BATCH_POLL_MAX_INTERVAL)
+    
+    def _map_concurrent(self, func, items: List[Any]) -> List[Any]:
+        """并发执行 API 调用，结果保持输入顺序
+        
+        Args:
+            func: 对单个元素执行的函数
+            items: 元素列表
+            
+        Returns:
+            结果列表
+        """
+        if self.max_concurrent_requests <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        
+        workers = min(self.max_concurrent_requests, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+    
+    def _create_completion(self, **kwargs):
+        """在速率限制和全局并发上限内调用 Chat Completions 并记录 token 用量"""
+        if self.token_limiter is not None:
+            # 译文长度与原文相当，按输入估算值的两倍预占 TPM 额度；在占用并发槽位前等待
+            prompt_tokens = sum(estimate_tokens(m["content"]) for m in kwargs["messages"])
+            self.token_limiter.acquire(prompt_tokens * 2)
+        with self.request_slots, self.rate_limiter:
+            response = self.client.chat.completions.create(**kwargs)
+        
+        # 记录token使用量
+        if hasattr(response, 'usage') and response.usage:
+            with self._usage_lock:
+                self.total_input_tokens += response.usage.prompt_tokens
+                self.total_output_tokens += response.usage.completion_tokens
+            self.logger.debug(
+                f"Token usage: {response.usage.prompt_tokens} input, "
+                f"{response.usage.completion_tokens} output"
+            )
+        return response
     
     def _build_system_prompt(self, source_language: str) -> str:
         """构建系统提示
@@ -228,7 +867,11 @@ class OpenAITranslator:
         Returns:
             系统提示
         """
-        target_lang_name = self._get_language_name(self.target_language)
+        cached = self._system_prompts.get(source_language)
+        if cached is not None:
+            return cached
+        
+        target_lang_name = self.target_lang_name
         target_speech_rate = self.settings.translation.target_speech_rate
         
         prompt = f"""You are a professional translator specializing in video subtitles.
@@ -246,16 +889,17 @@ Requirements:
    - Even if the original lacks punctuation, add it where natural pauses occur
    - Only use these punctuation marks: ! ? … , . -
    - For Chinese: use ！？…，。— (full-width versions)
-7. Return translations in the exact same order as input
-8. Output format: JSON array of translated strings only
+7. Return exactly one translation per input segment, keeping its index "i"
+8. Output format: a JSON object {{"translations": [{{"i": <index>, "t": "<translation>"}}]}}
 
 Calculation guide:
 - {target_speech_rate} chars/min = {target_speech_rate/60:.1f} chars/second
 - For a 3-second segment, aim for ~{target_speech_rate/60*3:.0f} characters
 
-Example input: [{{"text": "Hello everyone, welcome to our presentation", "duration": 2.5}}]
-Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
+Example input: {{"segments": [{{"i": 0, "text": "Hello everyone, welcome to our presentation", "duration": 2.5}}]}}
+Example output: {{"translations": [{{"i": 0, "t": "大家好，欢迎光临"}}]}}  (8 characters for 2.5 seconds)"""
         
+        self._system_prompts[source_language] = prompt
         return prompt
     
     def _build_batch_message(self, segments: List[TranscriptionSegment]) -> str:
@@ -271,83 +915,84 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
         gap_duration = self.settings.translation.gap_duration
         
         messages = []
-        for seg in segments:
+        for i, seg in enumerate(segments):
             # 可用时长 = 总时长 - 间隔时间，但不能小于0.5秒
             available_duration = max(0.5, (seg.end - seg.start) - gap_duration)
             messages.append({
+                "i": i,
                 "text": seg.text,
                 "duration": round(available_duration, 1)
             })
         
-        return json.dumps(messages, ensure_ascii=False)
+        if orjson is not None:
+            return orjson.dumps({"segments": messages}).decode()
+        return json.dumps({"segments": messages}, ensure_ascii=False)
     
-    def _parse_translations(self, content: str) -> List[str]:
+    def _parse_translations(self, content: str) -> Dict[int, str]:
         """解析翻译响应
         
         Args:
             content: API 响应内容
             
         Returns:
-            翻译文本列表
+            {片段序号: 译文} 字典
         """
         # 记录原始响应以便调试
         self.logger.debug(f"Raw API response: {content[:500]}..." if len(content) > 500 else f"Raw API response: {content}")
         
         # 检查并处理markdown代码块
-        if "```json" in content and "```" in content:
+        if "```json" in content:
             # 提取JSON内容
-            import re
-            json_match = re.search(r'```json\s*\n?(.+?)\n?```', content, re.DOTALL)
+            json_match = JSON_CODE_BLOCK_RE.search(content)
             if json_match:
                 content = json_match.group(1).strip()
                 self.logger.info("检测到markdown代码块，已提取JSON内容")
         
+        loads = orjson.loads if orjson is not None else json.loads
         try:
-            # 尝试解析 JSON
-            translations = json.loads(content)
+            data = loads(content)
             
             # 处理嵌套的JSON结构
-            if isinstance(translations, str):
+            if isinstance(data, str):
                 # 可能是双重编码的JSON
-                try:
-                    translations = json.loads(translations)
-                except:
-                    pass
-            
-            if not isinstance(translations, list):
-                self.logger.error(f"Response is not a list, got type: {type(translations)}")
-                raise APIError(f"Response is not a list, got: {type(translations).__name__}", api_name="OpenAI Translation")
-            
-            # 验证每个翻译项
-            result = []
-            for idx, item in enumerate(translations):
-                if isinstance(item, str):
-                    # 检查是否包含JSON格式
-                    if item.strip().startswith('[') or item.strip().startswith('{'):
-                        self.logger.warning(f"Translation item {idx} contains JSON-like content: {item[:100]}")
-                    result.append(item)
-                else:
-                    self.logger.warning(f"Translation item {idx} is not a string: {type(item).__name__}")
-                    result.append(str(item))
-            
-            self.logger.info(f"Successfully parsed {len(result)} translations")
-            return result
-            
-        except json.JSONDecodeError as e:
+                data = loads(data)
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError 是其子类
             self.logger.error(f"JSON decode error: {e}")
             self.logger.error(f"Failed to parse content: {content[:200]}...")
+            raise APIError("Failed to parse translations from response", api_name="OpenAI Translation") from e
+        
+        items = data.get("translations") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            self.logger.error(f"Response has no translation list, got type: {type(items)}")
+            raise APIError(f"Response is not a list, got: {type(items).__name__}", api_name="OpenAI Translation")
+        
+        # 验证每个翻译项
+        result = {}
+        for idx, item in enumerate(items):
+            if isinstance(item, dict):
+                index, text = item.get("i", idx), item.get("t")
+            else:
+                index, text = idx, item
             
-            # 如果不是有效 JSON，尝试按行分割
-            lines = content.strip().split('\n')
-            result = [line.strip() for line in lines if line.strip() and not line.strip().startswith('```')]
+            if text is None:
+                self.logger.warning(f"Translation item {idx} has no text")
+                continue
+            if not isinstance(text, str):
+                self.logger.warning(f"Translation item {idx} is not a string: {type(text).__name__}")
+                text = str(text)
+            elif text.strip().startswith(('[', '{')):
+                self.logger.warning(f"Translation item {idx} contains JSON-like content: {text[:100]}")
             
-            if result:
-                self.logger.warning(f"Fallback to line splitting, got {len(result)} lines")
-                return result
-            else:
-                raise APIError(f"Failed to parse translations from response", api_name="OpenAI Translation")
+            try:
+                result[int(index)] = text
+            except (TypeError, ValueError):
+                self.logger.warning(f"Translation item {idx} has invalid index: {index}")
+        
+        self.logger.info(f"Successfully parsed {len(result)} translations")
+        return result
     
-    def _get_language_name(self, code: str) -> str:
+    @staticmethod
+    def _get_language_name(code: str) -> str:
         """获取语言名称
         
         Args:
@@ -356,19 +1001,7 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
         Returns:
             语言名称
         """
-        language_map = {
-            "zh-cn": "Simplified Chinese",
-            "zh-tw": "Traditional Chinese",
-            "en": "English",
-            "ja": "Japanese",
-            "ko": "Korean",
-            "es": "Spanish",
-            "fr": "French",
-            "de": "German",
-            "ru": "Russian",
-            "ar": "Arabic"
-        }
-        return language_map.get(code.lower(), code)
+        return LANGUAGE_NAMES.get(code.lower(), code)
     
     def _merge_incomplete_segments(
         self, 
@@ -390,20 +1023,25 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
         
         while i < len(segments):
             current = segments[i]
-            merged_text = current.text
+            # 用列表累积片段文本，最后一次性拼接，避免长合并链上反复拼接字符串；
+            # 合并判断只看结尾标点，取最后一个非空白片段即可，无需每轮拼出完整文本
+            parts = [current.text]
+            tail = current.text
             start_time = current.start
             end_time = current.end
             
             # 检查是否需要与后续片段合并
             j = i + 1
-            while j < len(segments) and self._should_merge(merged_text, segments[j].text):
-                merged_text = merged_text + " " + segments[j].text
+            while j < len(segments) and self._should_merge(tail, segments[j].text):
+                parts.append(segments[j].text)
+                if segments[j].text.strip():
+                    tail = segments[j].text
                 end_time = segments[j].end
                 j += 1
             
             # 创建合并后的片段
             merged_segment = TranscriptionSegment(
-                text=merged_text,
+                text=" ".join(parts),
                 start=start_time,
                 end=end_time
             )
@@ -424,99 +1062,12 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
         Returns:
             是否应该合并
         """
-        # 检查当前句子是否以特定标点结尾
-        incomplete_endings = [',', ';', ':', '—', '–']
-        ends_incomplete = any(current_text.rstrip().endswith(p) for p in incomplete_endings)
-        
-        # 检查下一句是否以小写字母开头（表示句子延续）
-        starts_lowercase = next_text and next_text[0].islower()
-        
-        # 检查下一句是否以连词开头
-        conjunctions = ['but', 'and', 'or', 'so', 'yet', 'because', 'although', 'though', 
-                       'while', 'whereas', 'since', 'unless', 'if', 'when', 'where']
-        starts_with_conjunction = any(next_text.lower().startswith(conj) for conj in conjunctions)
-        
-        # 检查下一句是否是从句
-        subordinate_starters = ['which', 'that', 'who', 'whom', 'whose', 'where', 'when']
-        starts_with_subordinate = any(next_text.lower().startswith(sub) for sub in subordinate_starters)
-        
-        # 如果满足任一条件，则合并
-        return ends_incomplete or starts_lowercase or starts_with_conjunction or starts_with_subordinate
-    
-    def _align_translations(
-        self,
-        segments: List[TranscriptionSegment],
-        translations: List[str]
-    ) -> List[TranslationSegment]:
-        """智能对齐翻译结果和时间戳
-        
-        当翻译数量与原文不匹配时，智能推测哪些句子被合并，
-        并相应地调整时间戳。
-        
-        Args:
-            segments: 原始转录片段列表
-            translations: 翻译文本列表
-            
-        Returns:
-            对齐后的翻译片段列表
-        """
-        aligned_segments = []
-        seg_idx = 0
-        
-        for trans_idx, translation in enumerate(translations):
-            if seg_idx >= len(segments):
-                # 如果原文片段用完了，记录警告并跳过
-                self.logger.warning(
-                    f"Translation {trans_idx} has no corresponding original segment"
-                )
-                break
-            
-            # 开始时间取自当前原文片段
-            start_time = segments[seg_idx].start
-            end_time = segments[seg_idx].end
-            original_texts = [segments[seg_idx].text]
-            
-            # 检测是否需要合并多个原文片段
-            # 如果还有更多翻译要处理，且原文片段还有剩余
-            remaining_translations = len(translations) - trans_idx
-            remaining_segments = len(segments) - seg_idx
-            
-            # 如果原文片段多于剩余翻译，可能需要合并
-            if remaining_segments > remaining_translations and seg_idx + 1 < len(segments):
-                # 计算需要合并的片段数
-                segments_to_merge = remaining_segments - remaining_translations + 1
-                
-                # 合并相应数量的片段
-                for i in range(1, min(segments_to_merge, remaining_segments)):
-                    if seg_idx + i < len(segments):
-                        original_texts.append(segments[seg_idx + i].text)
-                        end_time = segments[seg_idx + i].end
-                
-                seg_idx += segments_to_merge
-            else:
-                seg_idx += 1
-            
-            # 创建对齐的翻译片段
-            aligned_segment = TranslationSegment(
-                original=" ".join(original_texts),
-                translated=translation,
-                start=start_time,
-                end=end_time
-            )
-            aligned_segments.append(aligned_segment)
-            
-            self.logger.debug(
-                f"Aligned: [{start_time:.1f}-{end_time:.1f}] "
-                f"{len(original_texts)} original(s) -> 1 translation"
-            )
-        
-        # 检查是否还有未处理的原文片段
-        if seg_idx < len(segments):
-            self.logger.warning(
-                f"{len(segments) - seg_idx} original segments were not aligned"
-            )
-        
-        return aligned_segments
+        # 以逗号类标点结尾、下一句小写开头、或以连词/从句引导词开头时合并，按开销从小到大短路判断
+        return (
+            current_text.rstrip().endswith(INCOMPLETE_ENDINGS)
+            or bool(next_text and next_text[0].islower())
+            or next_text.lower().startswith(CONTINUATIONS)
+        )
     
     def _translate_paragraph_mode(
         self,
@@ -544,23 +1095,22 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         
-        # 翻译段落并重分配时间戳
-        all_translated_segments = []
-        
+        # 并发翻译所有段落
         for i, paragraph in enumerate(paragraphs):
             self.logger.info(
                 f"翻译段落 {i+1}/{len(paragraphs)}: "
                 f"时长 {paragraph.duration:.1f}秒, "
                 f"文本长度 {len(paragraph.text)} 字符"
             )
-            
-            # 翻译整个段落
-            translated_text = self._translate_paragraph(
-                paragraph.text, 
-                source_language,
-                paragraph.duration
-            )
-            
+        translated_texts = self._map_concurrent(
+            lambda p: self._translate_paragraph(p.text, source_language, p.duration),
+            paragraphs
+        )
+        
+        # 按顺序重分配时间戳
+        all_translated_segments = []
+        
+        for paragraph, translated_text in zip(paragraphs, translated_texts):
             # 重新分配时间戳
             if self.settings.translation.redistribute_timestamps:
                 redistributed_dicts = self.timestamp_redistributor.redistribute_timestamps(
@@ -618,12 +1168,18 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
         Returns:
             翻译后的文本
         """
+        if self.cache:
+            cached = self.cache.get(paragraph_text, source_language, self.target_language)
+            if cached is not None:
+                self.logger.debug("段落命中翻译缓存")
+                return cached
+        
         # 构建系统提示
         system_prompt = self._build_paragraph_system_prompt(source_language, duration)
         
         try:
             # 调用 OpenAI API
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -633,11 +1189,6 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
                 max_tokens=4000
             )
             
-            # 记录token使用量
-            if hasattr(response, 'usage') and response.usage:
-                self.total_input_tokens += response.usage.prompt_tokens
-                self.total_output_tokens += response.usage.completion_tokens
-            
             # 获取翻译结果
             translated_text = response.choices[0].message.content.strip()
             
@@ -646,6 +1197,8 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
                 f"译文 {len(translated_text)} 字符"
             )
             
+            if self.cache:
+                self.cache.set(paragraph_text, translated_text, source_language, self.target_language)
             return translated_text
             
         except Exception as e:
@@ -666,7 +1219,7 @@ Example output: ["大家好，欢迎光临"]  (8 characters for 2.5 seconds)"""
         Returns:
             系统提示
         """
-        target_lang_name = self._get_language_name(self.target_language)
+        target_lang_name = self.target_lang_name
         target_speech_rate = self.settings.translation.target_speech_rate
         max_chars = int(duration * target_speech_rate / 60)
         
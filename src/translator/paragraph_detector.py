@@ -7,6 +7,20 @@ from ..transcriber.whisper_transcriber import TranscriptionSegment
 from ..config.settings import get_settings
 
 
+# 句末标点（含引号收尾），元组可直接传给 str.endswith 一次匹配
+SENTENCE_ENDINGS = (
+    '.', '!', '?', '。', '！', '？',
+    '."', '!"', '?"', '。"', '！"', '？"',
+    ".'", "!'", "?'", "。'", "！'", "？'"
+)
+
+# 表示与上一句连续的连词或从句引导词
+CONTINUATIONS = (
+    'but', 'and', 'or', 'so', 'yet', 'because', 'although', 'though',
+    'while', 'whereas', 'since', 'unless', 'if', 'when', 'where',
+    'which', 'that', 'who', 'whom', 'whose'
+)
+
 class Paragraph(BaseModel):
     """段落数据结构"""
     segments: List[TranscriptionSegment]
@@ -126,14 +140,7 @@ class ParagraphDetector:
         Returns:
             是否是句末
         """
-        sentence_endings = [
-            '.', '!', '?', '。', '！', '？',
-            '."', '!"', '?"', '。"', '！"', '？"',
-            ".\'", "!\'", "?\'", "。'", "！'", "？'"
-        ]
-        
-        text = text.strip()
-        return any(text.endswith(ending) for ending in sentence_endings)
+        return text.strip().endswith(SENTENCE_ENDINGS)
     
     def _should_continue_with_next(self, current_text: str, next_text: str) -> bool:
         """判断是否应该与下一句继续组成段落
@@ -150,14 +157,7 @@ class ParagraphDetector:
             return True
         
         # 检查下一句是否以连词或从句引导词开头
-        continuations = [
-            'but', 'and', 'or', 'so', 'yet', 'because', 'although', 'though',
-            'while', 'whereas', 'since', 'unless', 'if', 'when', 'where',
-            'which', 'that', 'who', 'whom', 'whose'
-        ]
-        
-        next_lower = next_text.lower()
-        return any(next_lower.startswith(word) for word in continuations)
+        return next_text.lower().startswith(CONTINUATIONS)
     
     def merge_short_paragraphs(self, paragraphs: List[Paragraph]) -> List[Paragraph]:
         """合并过短的段落
@@ -7,6 +7,12 @@ from pydantic import BaseModel
 from ..config.settings import get_settings
 
 
+# 预编译的分句正则：句末标点（连续标点视为一个）、逗号、非文字字符
+SENTENCE_END_RE = re.compile(r'([。！？.!?]+)')
+COMMA_RE = re.compile(r'[，,]')
+NON_WORD_RE = re.compile(r'[^\w]')
+
+
 class SentenceInfo(BaseModel):
     """句子信息"""
     text: str
@@ -89,29 +95,18 @@ class TimestampRedistributor:
         Returns:
             句子列表
         """
-        # 定义句子结束标记
-        sentence_endings = r'[。！？.!?]+'
-        
-        # 使用正则表达式分割，但保留标点
-        parts = re.split(f'({sentence_endings})', text)
-        
-        sentences = []
-        current_sentence = ""
-        
-        for i, part in enumerate(parts):
-            if i % 2 == 0:  # 文本部分
-                current_sentence = part.strip()
-            else:  # 标点部分
-                if current_sentence:
-                    sentences.append(current_sentence + part)
-                    current_sentence = ""
+        # 分割后偶数位为文本、奇数位为标点；文本非空时与其后的标点组成一句
+        parts = SENTENCE_END_RE.split(text)
+        sentences = [
+            stripped + punctuation
+            for part, punctuation in zip(parts[::2], parts[1::2])
+            if (stripped := part.strip())
+        ]
         
         # 处理最后可能没有标点的句子
-        if current_sentence:
-            sentences.append(current_sentence)
-        
-        # 过滤空句子
-        sentences = [s for s in sentences if s.strip()]
+        tail = parts[-1].strip()
+        if tail:
+            sentences.append(tail)
         
         # 处理逗号分割（对于过长的句子）
         final_sentences = []
@@ -147,7 +142,7 @@ class TimestampRedistributor:
                 break
         
         # 按逗号分割
-        parts = re.split(r'[，,]', sentence)
+        parts = COMMA_RE.split(sentence)
         
         # 重组句子，确保每部分不太短
         result = []
@@ -192,7 +187,7 @@ class TimestampRedistributor:
         
         for sentence in sentences:
             # 统计字符数（不包括标点和空格）
-            char_count = len(re.sub(r'[^\w]', '', sentence))
+            char_count = len(NON_WORD_RE.sub('', sentence))
             
             # 识别句末标点
             punctuation = ''
@@ -3,8 +3,11 @@
 
 保存处理进度，支持中断后恢复。
 """
+import atexit
 import json
 import logging
+import os
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -14,6 +17,30 @@ from .exceptions import FileProcessingError
 
 logger = logging.getLogger(__name__)
 
+# 待写队列中表示"删除断点"的标记
+_REMOVE = object()
+
+# orjson 为可选依赖，安装后序列化快一个数量级，输出与 json 模块兼容
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dump_json(data: Any) -> bytes:
+    """序列化为缩进的 UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _load_json(path: Path) -> Any:
+    """读取 JSON 文件"""
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class CheckpointManager:
     """断点管理器"""
@@ -27,6 +54,12 @@ class CheckpointManager:
         """
         self.checkpoint_dir = checkpoint_dir or Path.cwd() / ".checkpoints"
         self.checkpoint_dir.mkdir(exist_ok=True)
+        
+        # 断点由后台线程写盘，同一文件的多次更新只写最后一次
+        self._pending: Dict[Path, Any] = {}
+        self._writing = False
+        self._cond = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
     
     def get_checkpoint_path(self, video_path: Path) -> Path:
         """获取视频文件对应的断点文件路径
@@ -47,6 +80,8 @@ class CheckpointManager:
     ) -> None:
         """保存断点
         
+        只在内存中排队，由后台线程写盘，不阻塞处理流程。
+        
         Args:
             video_path: 视频文件路径
             state: 当前状态数据
@@ -61,13 +96,66 @@ class CheckpointManager:
             "state": state
         }
         
-        checkpoint_path = self.get_checkpoint_path(video_path)
+        self._enqueue(self.get_checkpoint_path(video_path), checkpoint_data)
+    
+    def _enqueue(self, checkpoint_path: Path, item: Any) -> None:
+        """把写入或删除操作交给后台线程"""
+        with self._cond:
+            self._pending[checkpoint_path] = item
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="checkpoint-writer", daemon=True
+                )
+                self._writer.start()
+                atexit.register(self.flush)
+            self._cond.notify_all()
+    
+    def _write_loop(self) -> None:
+        """后台写盘线程"""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch, self._pending = self._pending, {}
+                self._writing = True
+            
+            for checkpoint_path, item in batch.items():
+                if item is _REMOVE:
+                    self._remove_file(checkpoint_path)
+                else:
+                    self._write_file(checkpoint_path, item)
+            
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+    
+    def _write_file(self, checkpoint_path: Path, checkpoint_data: Dict[str, Any]) -> None:
+        """写入断点文件
+        
+        先写同目录下的临时文件再原子替换，进程中途退出也不会留下半截的断点。
+        """
+        tmp_path = checkpoint_path.with_suffix(".json.tmp")
         try:
-            with open(checkpoint_path, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint_data, f, ensure_ascii=False, indent=2)
+            tmp_path.write_bytes(_dump_json(checkpoint_data))
+            os.replace(tmp_path, checkpoint_path)
             logger.debug(f"保存断点到: {checkpoint_path}")
         except Exception as e:
             logger.warning(f"保存断点失败: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    def _remove_file(self, checkpoint_path: Path) -> None:
+        """删除断点文件"""
+        try:
+            checkpoint_path.unlink(missing_ok=True)
+            logger.debug(f"删除断点: {checkpoint_path}")
+        except Exception as e:
+            logger.warning(f"删除断点失败: {e}")
+    
+    def flush(self) -> None:
+        """等待所有排队的断点写入磁盘"""
+        with self._cond:
+            while self._pending or self._writing:
+                self._cond.wait()
     
     def load_checkpoint(self, video_path: Path) -> Optional[Dict[str, Any]]:
         """加载断点
@@ -80,12 +168,17 @@ class CheckpointManager:
         """
         checkpoint_path = self.get_checkpoint_path(video_path)
         
-        if not checkpoint_path.exists():
+        # 尚未写盘的更新优先
+        with self._cond:
+            pending = self._pending.get(checkpoint_path)
+        if pending is _REMOVE:
             return None
+        if pending is not None:
+            return pending
         
+        # 直接读取，不存在时捕获异常，省去一次 exists() 的 stat
         try:
-            with open(checkpoint_path, 'r', encoding='utf-8') as f:
-                checkpoint_data = json.load(f)
+            checkpoint_data = _load_json(checkpoint_path)
             
             # 验证是否为同一文件
             if checkpoint_data.get("video_path") != str(video_path.absolute()):
@@ -94,6 +187,8 @@ class CheckpointManager:
             
             logger.info(f"加载断点: {checkpoint_path}")
             return checkpoint_data
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.warning(f"加载断点失败: {e}")
             return None
@@ -103,14 +198,7 @@ class CheckpointManager:
         
         处理完成后删除断点
         """
-        checkpoint_path = self.get_checkpoint_path(video_path)
-        
-        if checkpoint_path.exists():
-            try:
-                checkpoint_path.unlink()
-                logger.debug(f"删除断点: {checkpoint_path}")
-            except Exception as e:
-                logger.warning(f"删除断点失败: {e}")
+        self._enqueue(self.get_checkpoint_path(video_path), _REMOVE)
     
     def list_checkpoints(self) -> List[Dict[str, Any]]:
         """列出所有断点
@@ -118,12 +206,12 @@ class CheckpointManager:
         Returns:
             断点信息列表
         """
+        self.flush()
         checkpoints = []
         
         for checkpoint_file in self.checkpoint_dir.glob("*.json"):
             try:
-                with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_json(checkpoint_file)
                 
                 checkpoints.append({
                     "video_path": data.get("video_path"),
@@ -150,13 +238,13 @@ class CheckpointManager:
         """
         from datetime import timedelta
         
+        self.flush()
         cutoff_date = datetime.now() - timedelta(days=days)
         deleted_count = 0
         
         for checkpoint_file in self.checkpoint_dir.glob("*.json"):
             try:
-                with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = _load_json(checkpoint_file)
                 
                 timestamp_str = data.get("timestamp")
                 if timestamp_str:
@@ -2,6 +2,9 @@
 from typing import Tuple
 from datetime import datetime
 
+# Batch API 的 token 单价为同步请求的一半
+BATCH_API_PRICE_RATIO = 0.5
+
 
 class CostCalculator:
     """API费用计算器"""
@@ -28,19 +31,30 @@ class CostCalculator:
         price_per_minute = self.pricing['whisper']['price_per_minute']
         return duration_minutes * price_per_minute
     
-    def calculate_gpt_cost(self, input_tokens: int, output_tokens: int) -> float:
+    def calculate_gpt_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        batch_input_tokens: int = 0,
+        batch_output_tokens: int = 0
+    ) -> float:
         """计算GPT API费用
         
         Args:
             input_tokens: 输入token数
             output_tokens: 输出token数
+            batch_input_tokens: 其中通过 Batch API 完成的输入token数
+            batch_output_tokens: 其中通过 Batch API 完成的输出token数
             
         Returns:
             费用（美元）
         """
         gpt_pricing = self.pricing['gpt4o']
-        input_cost = (input_tokens / 1_000_000) * gpt_pricing['input_per_million_tokens']
-        output_cost = (output_tokens / 1_000_000) * gpt_pricing['output_per_million_tokens']
+        # Batch API 部分按折扣价计费
+        billed_input = input_tokens - batch_input_tokens * (1 - BATCH_API_PRICE_RATIO)
+        billed_output = output_tokens - batch_output_tokens * (1 - BATCH_API_PRICE_RATIO)
+        input_cost = (billed_input / 1_000_000) * gpt_pricing['input_per_million_tokens']
+        output_cost = (billed_output / 1_000_000) * gpt_pricing['output_per_million_tokens']
         return input_cost + output_cost
     
     def format_cost_summary(
@@ -5,8 +5,9 @@ import logging.handlers
 from pathlib import Path
 from typing import List, Optional, Union, Dict
 import hashlib
+import random
 import time
-from functools import wraps
+from functools import lru_cache, wraps
 from datetime import datetime
 
 
@@ -76,6 +77,15 @@ def ensure_dir(path: Union[str, Path]) -> Path:
     return path
 
 
+@lru_cache(maxsize=1024)
+def ensure_dir_once(path: Path) -> Path:
+    """确保目录存在，同一进程内每个目录只创建一次
+    
+    批量处理时多个输出文件写入同一目录，避免每个文件都做一次 mkdir（网络文件系统上是一次往返）。
+    """
+    return ensure_dir(path)
+
+
 def get_file_hash(file_path: Path) -> str:
     """获取文件的MD5哈希值"""
     hash_md5 = hashlib.md5()
@@ -90,10 +100,30 @@ def get_file_size(file_path: Path) -> int:
     return file_path.stat().st_size
 
 
+# 支持的视频扩展名
+# 元组形式可直接传给 str.endswith，一次调用完成全部后缀匹配
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv')
+
+
 def is_video_file(file_path: Path) -> bool:
     """检查是否为支持的视频文件"""
-    video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'}
-    return file_path.suffix.lower() in video_extensions
+    return file_path.name.lower().endswith(VIDEO_EXTENSIONS)
+
+
+def _scan_video_files(directory: str, recursive: bool) -> List[str]:
+    """用 os.scandir 扫描目录
+    
+    先按文件名后缀过滤，只有匹配的条目才判断类型；
+    scandir 的 is_file/is_dir 直接使用目录项中的类型信息，通常不需要额外 stat。
+    """
+    matches = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(VIDEO_EXTENSIONS) and entry.is_file():
+                matches.append(entry.path)
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                matches.extend(_scan_video_files(entry.path, recursive))
+    return matches
 
 
 def get_video_files(directory: Path, recursive: bool = False) -> List[Path]:
@@ -106,20 +136,7 @@ def get_video_files(directory: Path, recursive: bool = False) -> List[Path]:
     Returns:
         排序后的视频文件列表
     """
-    video_files = []
-    
-    if recursive:
-        # 递归查找所有视频文件
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and is_video_file(file_path):
-                video_files.append(file_path)
-    else:
-        # 只查找当前目录
-        for file_path in directory.iterdir():
-            if file_path.is_file() and is_video_file(file_path):
-                video_files.append(file_path)
-    
-    return sorted(video_files)
+    return sorted(Path(p) for p in _scan_video_files(str(directory), recursive))
 
 
 def format_duration(seconds: float) -> str:
@@ -130,8 +147,11 @@ def format_duration(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
 
-def retry(max_attempts: int = 3, delay: float = 1.0):
-    """重试装饰器"""
+def retry(max_attempts: int = 3, delay: float = 1.0, max_delay: float = 60.0):
+    """重试装饰器
+
+    指数退避并加入随机抖动，避免并发调用在同一时刻集中重试。
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -142,7 +162,7 @@ def retry(max_attempts: int = 3, delay: float = 1.0):
                 except Exception as e:
                     last_exception = e
                     if attempt < max_attempts - 1:
-                        time.sleep(delay * (attempt + 1))
+                        time.sleep(random.uniform(0, min(max_delay, delay * 2 ** attempt)))
                     else:
                         raise last_exception
             return None
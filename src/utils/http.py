@@ -0,0 +1,65 @@
+"""
+HTTP 客户端
+
+进程内共享一个带连接池的 httpx 客户端，所有 API 请求复用已建立的 TLS 连接。
+"""
+import atexit
+import logging
+import threading
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 连接池上限，需不小于 openai.max_concurrent_requests
+MAX_CONNECTIONS = 64
+MAX_KEEPALIVE_CONNECTIONS = 32
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 需要额外安装 h2（pip install httpx[http2]）"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_shared_client() -> httpx.Client:
+    """获取进程共享的 HTTP 客户端
+
+    首次调用时创建，之后的调用直接返回同一个实例。
+    客户端保持 httpx 的默认超时，超时时间由各个 OpenAI 客户端自行传入：
+    openai SDK 会沿用自定义客户端上的非默认超时，这里设置会覆盖所有调用方。
+
+    Returns:
+        httpx 客户端
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            http2 = _http2_available()
+            _client = httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+                ),
+                follow_redirects=True
+            )
+            atexit.register(close_shared_client)
+            logger.debug(f"创建共享 HTTP 客户端 (http2={http2})")
+        return _client
+
+
+def close_shared_client() -> None:
+    """关闭共享的 HTTP 客户端"""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
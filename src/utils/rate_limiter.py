@@ -0,0 +1,60 @@
+"""
+速率限制
+
+线程安全的漏桶限流器，用于把并发 API 请求控制在服务商的 RPM 限额内。
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """漏桶限流器
+
+    在任意 time_period 秒的窗口内最多放行 max_rate 个单位，
+    支持 `with limiter:` 的用法。
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        """
+        初始化限流器
+
+        Args:
+            max_rate: 每个时间窗口允许的最大数量
+            time_period: 时间窗口（秒）
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._level = 0.0
+        self._last_check = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _leak(self) -> None:
+        """按流逝的时间释放容量"""
+        now = time.monotonic()
+        elapsed = now - self._last_check
+        self._level = max(0.0, self._level - elapsed * self._rate_per_sec)
+        self._last_check = now
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """获取容量，不足时阻塞等待
+
+        Args:
+            amount: 需要的数量
+        """
+        amount = min(amount, self.max_rate)
+        while True:
+            with self._lock:
+                self._leak()
+                if self._level + amount <= self.max_rate:
+                    self._level += amount
+                    return
+                wait = (self._level + amount - self.max_rate) / self._rate_per_sec
+            time.sleep(wait)
+
+    def __enter__(self) -> "RateLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
@@ -0,0 +1,235 @@
+"""
+翻译缓存
+
+使用 SQLite 持久化翻译结果，重复处理同一视频或重复句子时跳过 API 调用。
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .helpers import ensure_dir
+
+logger = logging.getLogger(__name__)
+
+# 内存缓存默认保留的条目数
+MEMORY_CACHE_SIZE = 4096
+
+# 批量查询时每条 SQL 携带的键数量（旧版 SQLite 单条语句最多 999 个参数）
+LOOKUP_CHUNK_SIZE = 500
+
+
+class MemoryTranslationCache:
+    """进程内的有界 LRU 翻译缓存
+
+    接口与 TranslationCache 相同。未启用持久化缓存时，
+    同一进程内重复出现的句子（片头、口头禅、"Thank you." 等）也只请求一次。
+    """
+
+    def __init__(self, model: str, maxsize: int = MEMORY_CACHE_SIZE):
+        """
+        初始化内存缓存
+
+        Args:
+            model: 翻译使用的模型，作为缓存键的一部分
+            maxsize: 最多保留的条目数，超出后淘汰最久未使用的条目
+        """
+        self.model = model
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """查询单条翻译"""
+        return self.get_many([text], source_lang, target_lang).get(text)
+
+    def get_many(
+        self,
+        texts: Iterable[str],
+        source_lang: str,
+        target_lang: str
+    ) -> Dict[str, str]:
+        """批量查询翻译，命中的条目移到最近使用的一端
+
+        Returns:
+            命中缓存的 {原文: 译文} 字典
+        """
+        result = {}
+        with self._lock:
+            for text in texts:
+                key = (source_lang, target_lang, text)
+                translation = self._entries.get(key)
+                if translation is not None:
+                    self._entries.move_to_end(key)
+                    result[text] = translation
+        return result
+
+    def set(self, text: str, translation: str, source_lang: str, target_lang: str) -> None:
+        """写入单条翻译"""
+        self.set_many([(text, translation)], source_lang, target_lang)
+
+    def set_many(
+        self,
+        items: List[Tuple[str, str]],
+        source_lang: str,
+        target_lang: str
+    ) -> None:
+        """批量写入翻译，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            for text, translation in items:
+                key = (source_lang, target_lang, text)
+                self._entries[key] = translation
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def close(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+
+class TranslationCache:
+    """翻译缓存"""
+
+    def __init__(self, cache_file: Path, model: str):
+        """
+        初始化翻译缓存
+
+        Args:
+            cache_file: SQLite 数据库文件路径
+            model: 翻译使用的模型，作为缓存键的一部分
+        """
+        self.cache_file = Path(cache_file)
+        self.model = model
+        self._lock = threading.Lock()
+        # 内存 LRU 层：重复出现的短句直接命中，不再计算哈希和查询数据库
+        self._memory = MemoryTranslationCache(model)
+        self._key_prefixes: Dict[Tuple[str, str], Any] = {}
+
+        ensure_dir(self.cache_file.parent)
+        self._conn = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL 模式下 NORMAL 只在检查点时 fsync，每次提交只是追加写 WAL；
+        # 断电最多丢失最近的缓存条目，重新翻译即可恢复
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "hash TEXT PRIMARY KEY, src TEXT, tgt TEXT, model TEXT, "
+            "src_text TEXT, translation TEXT, ts INTEGER)"
+        )
+        self._conn.commit()
+
+    def make_key(self, text: str, source_lang: str, target_lang: str) -> str:
+        """生成缓存键
+
+        Args:
+            text: 原文
+            source_lang: 源语言
+            target_lang: 目标语言
+
+        Returns:
+            缓存键（blake2b 十六进制摘要）
+        """
+        # "模型|源语言|目标语言|" 前缀对同一语言对固定不变，预先哈希后复制状态，
+        # 只需再喂入原文；摘要与整串哈希完全一致，已有缓存键保持有效
+        prefix = self._key_prefixes.get((source_lang, target_lang))
+        if prefix is None:
+            prefix = hashlib.blake2b(f"{self.model}|{source_lang}|{target_lang}|".encode("utf-8"))
+            self._key_prefixes[(source_lang, target_lang)] = prefix
+        h = prefix.copy()
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """查询单条翻译
+
+        Returns:
+            缓存的译文，不存在则返回 None
+        """
+        return self.get_many([text], source_lang, target_lang).get(text)
+
+    def get_many(
+        self,
+        texts: Iterable[str],
+        source_lang: str,
+        target_lang: str
+    ) -> Dict[str, str]:
+        """批量查询翻译
+
+        Args:
+            texts: 原文列表
+            source_lang: 源语言
+            target_lang: 目标语言
+
+        Returns:
+            命中缓存的 {原文: 译文} 字典
+        """
+        texts = list(texts)
+        result = self._memory.get_many(texts, source_lang, target_lang)
+        missing = [text for text in texts if text not in result]
+        if missing:
+            found = {}
+            keys = {self.make_key(text, source_lang, target_lang): text for text in missing}
+            key_list = list(keys)
+            with self._lock:
+                # 按块用 IN 查询，一次往返取回多条，块大小不超过 SQLite 的参数个数上限
+                for i in range(0, len(key_list), LOOKUP_CHUNK_SIZE):
+                    chunk = key_list[i:i + LOOKUP_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT hash, translation FROM translations WHERE hash IN ({placeholders})",
+                        chunk
+                    ).fetchall()
+                    for key, translation in rows:
+                        found[keys[key]] = translation
+            if found:
+                self._memory.set_many(list(found.items()), source_lang, target_lang)
+                result.update(found)
+
+        if result:
+            logger.debug(f"翻译缓存命中 {len(result)} 条")
+        return result
+
+    def set(self, text: str, translation: str, source_lang: str, target_lang: str) -> None:
+        """写入单条翻译"""
+        self.set_many([(text, translation)], source_lang, target_lang)
+
+    def set_many(
+        self,
+        items: List[Tuple[str, str]],
+        source_lang: str,
+        target_lang: str
+    ) -> None:
+        """批量写入翻译
+
+        Args:
+            items: (原文, 译文) 列表
+            source_lang: 源语言
+            target_lang: 目标语言
+        """
+        self._memory.set_many(items, source_lang, target_lang)
+        now = int(time.time())
+        rows = [
+            (self.make_key(text, source_lang, target_lang), source_lang, target_lang,
+             self.model, text, translation, now)
+            for text, translation in items
+        ]
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"写入翻译缓存失败: {e}")
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()